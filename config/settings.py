@@ -25,6 +25,8 @@ class Settings(BaseSettings):
     MAX_WORKERS: int = 4
     BATCH_SIZE: int = 1000
     CACHE_TTL: int = 300  # 5 minutes
+    REDIS_MAX_CONNECTIONS: int = 32
+    REDIS_POOL_TIMEOUT: int = 20  # seconds to wait for a free pooled connection
     
     # Application
     ENVIRONMENT: str = "development"
@@ -5,6 +5,7 @@ from datetime import datetime, timedelta
 import backoff
 from ratelimit import limits, sleep_and_retry
 import logging
+import orjson
 from base64 import b64decode
 
 from config import settings
@@ -63,7 +64,7 @@ class HeliusClient:
                     params=params
                 ) as response:
                     response.raise_for_status()
-                    data = await response.json()
+                    data = await response.json(loads=orjson.loads)
                     
                     if not data:
                         break
@@ -139,7 +140,7 @@ class HeliusClient:
                 params=params
             ) as response:
                 response.raise_for_status()
-                return await response.json()
+                return await response.json(loads=orjson.loads)
         except aiohttp.ClientError as e:
             logger.error(f"Error fetching address transactions: {e}")
             raise
@@ -270,7 +271,7 @@ class HeliusClient:
                     json={"transactions": batch}
                 ) as response:
                     response.raise_for_status()
-                    transactions = await response.json()
+                    transactions = await response.json(loads=orjson.loads)
                     all_transactions.extend(transactions)
                     
                 await asyncio.sleep(1 / self.rate_limit)
@@ -1,14 +1,66 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Optional, List
+from base64 import b64encode
+from functools import partial
+import struct
+from typing import Any, Callable, Dict, Optional, List, Tuple
 from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
+SOL_MINT = 'So11111111111111111111111111111111111111112'
+
+# Transfer routes, indexed by (user_sends << 2 | user_receives << 1 | is_sol).
+# A transfer the user both sends and receives counts as outgoing, matching the
+# source-first checks of the analyzers.
+ROUTE_NONE, ROUTE_TOKEN_IN, ROUTE_TOKEN_OUT, ROUTE_SOL_IN, ROUTE_SOL_OUT = range(5)
+TRANSFER_ROUTES = (
+    ROUTE_NONE,       # 000 token, unrelated
+    ROUTE_NONE,       # 001 SOL, unrelated
+    ROUTE_TOKEN_IN,   # 010 token received
+    ROUTE_SOL_IN,     # 011 SOL received
+    ROUTE_TOKEN_OUT,  # 100 token sent
+    ROUTE_SOL_OUT,    # 101 SOL sent
+    ROUTE_TOKEN_OUT,  # 110 token sent to self
+    ROUTE_SOL_OUT     # 111 SOL sent to self
+)
+
+
+def b64_prefix(discriminator: bytes) -> str:
+    """Return the base64 characters fully determined by a discriminator.
+    
+    Every 6 bits of input map to one base64 character, so an 8-byte
+    discriminator fixes the first 10 characters of the encoded instruction
+    data regardless of the bytes that follow it.
+    """
+    return b64encode(discriminator).decode()[:len(discriminator) * 8 // 6]
+
 
 class BaseDEXParser(ABC):
     """Base class for DEX-specific transaction parsers"""
     
+    # Base64 prefixes of the swap discriminators this parser accepts.
+    # Empty means the parser does not filter on discriminator.
+    DISCRIMINATOR_PREFIXES: Tuple[str, ...] = ()
+    
+    # Swap instruction fields following the 8-byte discriminator, as
+    # (name, struct format) pairs in byte order
+    LAYOUT: Tuple[Tuple[str, str], ...] = ()
+    
+    # Set by __init_subclass__ from LAYOUT: total instruction size including
+    # the discriminator, and a decoder returning the LAYOUT field values
+    LAYOUT_SIZE: int = 8
+    _decode: Callable[[bytes], Tuple[Any, ...]]
+    
+    def __init_subclass__(cls, **kwargs):
+        """Compile the declared LAYOUT into a single struct decoder"""
+        super().__init_subclass__(**kwargs)
+        
+        if cls.LAYOUT:
+            layout = struct.Struct('<' + ''.join(fmt for _, fmt in cls.LAYOUT))
+            cls.LAYOUT_SIZE = 8 + layout.size
+            cls._decode = staticmethod(partial(layout.unpack_from, offset=8))
+            
     def __init__(self):
         self.program_id = self.get_program_id()
         self.dex_name = self.get_dex_name()
@@ -35,8 +87,21 @@ class BaseDEXParser(ABC):
         """Parse swap transaction into standardized format"""
         pass
         
+    def has_swap_discriminator(self, data: str) -> bool:
+        """Check raw base64 instruction data against known discriminators
+        
+        Lets parsers reject non-swap instructions without decoding them.
+        """
+        if not self.DISCRIMINATOR_PREFIXES:
+            return True
+        return data.startswith(self.DISCRIMINATOR_PREFIXES)
+        
     def extract_token_transfers(self, tx: Dict) -> List[Dict]:
-        """Extract token transfer information from transaction"""
+        """Extract token transfer information from transaction
+        
+        Amounts and decimals are converted to ints once here so the
+        per-parser analysis loops can use them directly.
+        """
         transfers = []
         
         # Look for token transfer instructions
@@ -47,9 +112,12 @@ class BaseDEXParser(ABC):
                     parsed = inner_ix.get('parsed', {})
                     if parsed.get('type') in ['transfer', 'transferChecked']:
                         info = parsed.get('info', {})
+                        token_amount = info.get('tokenAmount', {})
+                        amount = info.get('amount') or token_amount.get('amount')
+                        decimals = token_amount.get('decimals')
                         transfers.append({
-                            'amount': info.get('amount') or info.get('tokenAmount', {}).get('amount'),
-                            'decimals': info.get('tokenAmount', {}).get('decimals'),
+                            'amount': int(amount) if amount is not None else 0,
+                            'decimals': int(decimals) if decimals is not None else 9,
                             'mint': info.get('mint'),
                             'source': info.get('source'),
                             'destination': info.get('destination'),
@@ -64,7 +132,7 @@ class BaseDEXParser(ABC):
         token_mint: str,
         user_address: str
     ) -> Dict:
-        """Calculate buy/sell amounts from transfers"""
+        """Calculate buy/sell amounts from transfers produced by extract_token_transfers"""
         
         sol_amount = 0
         token_amount = 0
@@ -75,22 +143,21 @@ class BaseDEXParser(ABC):
             if transfer['mint'] == 'So11111111111111111111111111111111111111112':
                 # User sending SOL = buy
                 if transfer['source'] == user_address:
-                    sol_amount = int(transfer['amount']) / 1e9
+                    sol_amount = transfer['amount'] / (10 ** transfer['decimals'])
                     is_buy = True
                 # User receiving SOL = sell
                 elif transfer['destination'] == user_address:
-                    sol_amount = int(transfer['amount']) / 1e9
+                    sol_amount = transfer['amount'] / (10 ** transfer['decimals'])
                     is_buy = False
                     
             # Token transfers
             elif transfer['mint'] == token_mint:
-                decimals = transfer.get('decimals', 9)
                 # User receiving tokens = buy
                 if transfer['destination'] == user_address:
-                    token_amount = int(transfer['amount']) / (10 ** decimals)
+                    token_amount = transfer['amount'] / (10 ** transfer['decimals'])
                 # User sending tokens = sell
                 elif transfer['source'] == user_address:
-                    token_amount = int(transfer['amount']) / (10 ** decimals)
+                    token_amount = transfer['amount'] / (10 ** transfer['decimals'])
                     
         return {
             'sol_amount': sol_amount,
@@ -1,9 +1,8 @@
 from base64 import b64decode
-import struct
 from typing import Dict, Optional
 import logging
 
-from .dex_base import BaseDEXParser
+from .dex_base import BaseDEXParser, b64_prefix
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +12,9 @@ class MeteoraDLMMParser(BaseDEXParser):
     
     # Swap instruction discriminator
     SWAP_DISCRIMINATOR = bytes([0x3f, 0xa9, 0xb3, 0xa2, 0x8f, 0x3f, 0x56, 0xb8])
+    DISCRIMINATOR_PREFIXES = (b64_prefix(SWAP_DISCRIMINATOR),)
+    
+    LAYOUT = (('amount_in', 'Q'), ('min_amount_out', 'Q'), ('active_bin_id', 'i'))
     
     # Bin constants
     BASIS_POINT_MAX = 10000
@@ -40,26 +42,30 @@ class MeteoraDLMMParser(BaseDEXParser):
             if not dlmm_ix:
                 return None
                 
+            # Skip non-swap instructions before decoding
+            raw_data = dlmm_ix.get('data', '')
+            if not self.has_swap_discriminator(raw_data):
+                return None
+                
             # Decode instruction data
-            data = b64decode(dlmm_ix.get('data', ''))
+            data = b64decode(raw_data)
             if len(data) < 8:
                 return None
                 
             # Check discriminator
             discriminator = data[:8]
             if discriminator != self.SWAP_DISCRIMINATOR:
-                logger.debug(f"Unknown DLMM discriminator: {discriminator.hex()}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Unknown DLMM discriminator: %s", discriminator.hex())
                 return None
                 
             # Parse swap data
             # Layout: discriminator (8) + amount_in (8) + min_amount_out (8) + active_bin_id (4)
-            if len(data) < 28:
-                logger.error(f"Invalid DLMM swap data length: {len(data)}")
+            if len(data) < self.LAYOUT_SIZE:
+                logger.error("Invalid DLMM swap data length: %d", len(data))
                 return None
                 
-            amount_in = struct.unpack('<Q', data[8:16])[0]
-            min_amount_out = struct.unpack('<Q', data[16:24])[0]
-            active_bin_id = struct.unpack('<i', data[24:28])[0]
+            amount_in, min_amount_out, active_bin_id = self._decode(data)
             
             # Parse accounts
             # [lbPair, binArrayBitmapExtension (optional), reserveX, reserveY, 
@@ -67,7 +73,7 @@ class MeteoraDLMMParser(BaseDEXParser):
             #  hostFeeIn (optional), userAccount, tokenXProgram, tokenYProgram, eventAuthority]
             accounts = dlmm_ix.get('accounts', [])
             if len(accounts) < 8:
-                logger.error(f"Insufficient DLMM accounts: {len(accounts)}")
+                logger.error("Insufficient DLMM accounts: %d", len(accounts))
                 return None
                 
             lb_pair = accounts[0]
@@ -125,8 +131,8 @@ class MeteoraDLMMParser(BaseDEXParser):
             
             return result
             
-        except Exception as e:
-            logger.error(f"Error parsing DLMM transaction {tx.get('signature')}: {e}")
+        except Exception:
+            logger.exception("Error parsing DLMM transaction %s", tx.get('signature'))
             return None
             
     def _analyze_dlmm_swap(
@@ -155,8 +161,8 @@ class MeteoraDLMMParser(BaseDEXParser):
             mint = transfer.get('mint')
             source = transfer.get('source')
             destination = transfer.get('destination')
-            amount = int(transfer.get('amount', 0))
-            decimals = transfer.get('decimals', 9)
+            amount = transfer['amount']
+            decimals = transfer['decimals']
             
             # Skip if not user related
             if source != user_address and destination != user_address:
@@ -1,9 +1,16 @@
 from base64 import b64decode
-import struct
 from typing import Dict, Optional
 import logging
 
-from .dex_base import BaseDEXParser
+from .dex_base import (
+    BaseDEXParser,
+    SOL_MINT,
+    TRANSFER_ROUTES,
+    ROUTE_NONE,
+    ROUTE_TOKEN_IN,
+    ROUTE_SOL_IN,
+    ROUTE_SOL_OUT
+)
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +21,8 @@ class MeteoraDynParser(BaseDEXParser):
     # Swap instruction discriminator (example - actual may differ)
     SWAP_DISCRIMINATOR = bytes([0x70, 0xe9, 0x3c, 0x6b, 0xd8, 0x7f, 0x33, 0x05])
     
+    LAYOUT = (('amount_in', 'Q'), ('min_amount_out', 'Q'))
+    
     def get_program_id(self) -> str:
         return "Eo7WjKq67rjJQSZxS6z3YkapzY3eMj6Xy8X5EQVn5UaB"
         
@@ -48,17 +57,16 @@ class MeteoraDynParser(BaseDEXParser):
             
             # Parse basic swap data
             # Layout varies but typically includes amount_in and min_amount_out
-            if len(data) < 24:
-                logger.error(f"Invalid Dynamic Pool swap data length: {len(data)}")
+            if len(data) < self.LAYOUT_SIZE:
+                logger.error("Invalid Dynamic Pool swap data length: %d", len(data))
                 return None
                 
-            amount_in = struct.unpack('<Q', data[8:16])[0]
-            min_amount_out = struct.unpack('<Q', data[16:24])[0]
+            amount_in, min_amount_out = self._decode(data)
             
             # Parse accounts
             accounts = dyn_ix.get('accounts', [])
             if len(accounts) < 6:
-                logger.error(f"Insufficient Dynamic Pool accounts: {len(accounts)}")
+                logger.error("Insufficient Dynamic Pool accounts: %d", len(accounts))
                 return None
                 
             # Account layout varies by instruction type
@@ -102,15 +110,13 @@ class MeteoraDynParser(BaseDEXParser):
             
             return result
             
-        except Exception as e:
-            logger.error(f"Error parsing Dynamic Pool transaction {tx.get('signature')}: {e}")
+        except Exception:
+            logger.exception("Error parsing Dynamic Pool transaction %s", tx.get('signature'))
             return None
             
     def _analyze_dynamic_swap(self, transfers: list, user_address: str) -> Dict:
         """Analyze transfers to determine swap details for dynamic pools"""
         
-        sol_mint = 'So11111111111111111111111111111111111111112'
-        
         token_mint = None
         token_amount = 0
         sol_amount = 0
@@ -126,31 +132,24 @@ class MeteoraDynParser(BaseDEXParser):
         
         for transfer in transfers:
             mint = transfer.get('mint')
-            source = transfer.get('source')
-            destination = transfer.get('destination')
-            amount = int(transfer.get('amount', 0))
-            decimals = transfer.get('decimals', 9)
+            route = TRANSFER_ROUTES[
+                (transfer.get('source') == user_address) << 2
+                | (transfer.get('destination') == user_address) << 1
+                | (mint == SOL_MINT)
+            ]
             
             # Only process user-related transfers
-            if source != user_address and destination != user_address:
+            if route == ROUTE_NONE:
                 continue
                 
-            if mint == sol_mint:
-                # SOL transfer
-                if source == user_address:
-                    user_transfers['sol_out'] += amount / 1e9
-                else:
-                    user_transfers['sol_in'] += amount / 1e9
+            if route == ROUTE_SOL_OUT:
+                user_transfers['sol_out'] += transfer['amount'] / 1e9
+            elif route == ROUTE_SOL_IN:
+                user_transfers['sol_in'] += transfer['amount'] / 1e9
             else:
                 # Token transfer
-                if source == user_address:
-                    if mint not in user_transfers['tokens_out']:
-                        user_transfers['tokens_out'][mint] = 0
-                    user_transfers['tokens_out'][mint] += amount / (10 ** decimals)
-                else:
-                    if mint not in user_transfers['tokens_in']:
-                        user_transfers['tokens_in'][mint] = 0
-                    user_transfers['tokens_in'][mint] += amount / (10 ** decimals)
+                bucket = user_transfers['tokens_in' if route == ROUTE_TOKEN_IN else 'tokens_out']
+                bucket[mint] = bucket.get(mint, 0) + transfer['amount'] / (10 ** transfer['decimals'])
                     
         # Determine swap type based on transfers
         if user_transfers['sol_out'] > 0 and len(user_transfers['tokens_in']) > 0:
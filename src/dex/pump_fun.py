@@ -3,7 +3,7 @@ import struct
 from typing import Dict, Optional
 import logging
 
-from .dex_base import BaseDEXParser
+from .dex_base import BaseDEXParser, b64_prefix
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +14,13 @@ class PumpFunParser(BaseDEXParser):
     # Instruction discriminators
     BUY_DISCRIMINATOR = 16927863322537952870
     SELL_DISCRIMINATOR = 12502976635542562355
+    DISCRIMINATOR_PREFIXES = (
+        b64_prefix(struct.pack('<Q', BUY_DISCRIMINATOR)),
+        b64_prefix(struct.pack('<Q', SELL_DISCRIMINATOR))
+    )
+    
+    # Buy: sol_amount + min_tokens, sell: token_amount + min_sol
+    LAYOUT = (('amount', 'Q'), ('limit', 'Q'))
     
     # pump.fun specific constants
     TOKEN_DECIMALS = 6  # pump.fun tokens always have 6 decimals
@@ -43,10 +50,15 @@ class PumpFunParser(BaseDEXParser):
             if not pump_ix:
                 return None
                 
+            # Skip non-swap instructions before decoding
+            raw_data = pump_ix.get('data', '')
+            if not self.has_swap_discriminator(raw_data):
+                return None
+                
             # Decode instruction data
-            data = b64decode(pump_ix.get('data', ''))
+            data = b64decode(raw_data)
             if len(data) < 8:
-                logger.error(f"Invalid instruction data length: {len(data)}")
+                logger.error("Invalid instruction data length: %d", len(data))
                 return None
                 
             discriminator = struct.unpack('<Q', data[:8])[0]
@@ -56,32 +68,30 @@ class PumpFunParser(BaseDEXParser):
             is_sell = discriminator == self.SELL_DISCRIMINATOR
             
             if not is_buy and not is_sell:
-                logger.debug(f"Unknown discriminator: {discriminator}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Unknown discriminator: %d", discriminator)
                 return None
                 
             # Parse amounts based on transaction type
+            if len(data) < self.LAYOUT_SIZE:
+                return None
+                
+            amount, limit = self._decode(data)
+            
             if is_buy:
                 # Buy transaction structure: discriminator (8) + sol_amount (8) + min_tokens (8)
-                if len(data) >= 24:
-                    sol_amount = struct.unpack('<Q', data[8:16])[0] / 1e9
-                    min_tokens = struct.unpack('<Q', data[16:24])[0] / (10 ** self.TOKEN_DECIMALS)
-                    token_amount = min_tokens  # Approximate, actual may be higher
-                else:
-                    return None
+                sol_amount = amount / 1e9
+                token_amount = limit / (10 ** self.TOKEN_DECIMALS)  # Approximate, actual may be higher
             else:
                 # Sell transaction structure: discriminator (8) + token_amount (8) + min_sol (8)
-                if len(data) >= 24:
-                    token_amount = struct.unpack('<Q', data[8:16])[0] / (10 ** self.TOKEN_DECIMALS)
-                    min_sol = struct.unpack('<Q', data[16:24])[0] / 1e9
-                    sol_amount = min_sol  # Approximate, actual may be higher
-                else:
-                    return None
+                token_amount = amount / (10 ** self.TOKEN_DECIMALS)
+                sol_amount = limit / 1e9  # Approximate, actual may be higher
                     
             # Get token mint from accounts
             # Account order: [token_mint, bonding_curve, bonding_curve_token_account, user, user_token_account, ...]
             accounts = pump_ix.get('accounts', [])
             if len(accounts) < 5:
-                logger.error(f"Insufficient accounts: {len(accounts)}")
+                logger.error("Insufficient accounts: %d", len(accounts))
                 return None
                 
             token_mint = accounts[0]
@@ -111,8 +121,8 @@ class PumpFunParser(BaseDEXParser):
             
             return result
             
-        except Exception as e:
-            logger.error(f"Error parsing pump.fun transaction {tx.get('signature')}: {e}")
+        except Exception:
+            logger.exception("Error parsing pump.fun transaction %s", tx.get('signature'))
             return None
             
     def _parse_logs(self, log_messages: list) -> Dict:
@@ -1,10 +1,17 @@
 from base64 import b64decode
-import struct
 from typing import Dict, Optional, Tuple
 import logging
 import math
 
-from .dex_base import BaseDEXParser
+from .dex_base import (
+    BaseDEXParser,
+    b64_prefix,
+    SOL_MINT,
+    TRANSFER_ROUTES,
+    ROUTE_NONE,
+    ROUTE_SOL_IN,
+    ROUTE_SOL_OUT
+)
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +21,15 @@ class RaydiumCLMMParser(BaseDEXParser):
     
     # Swap instruction discriminator
     SWAP_DISCRIMINATOR = bytes([0x2b, 0x1a, 0x5f, 0x5e, 0x1f, 0x35, 0x64, 0x77])
+    DISCRIMINATOR_PREFIXES = (b64_prefix(SWAP_DISCRIMINATOR),)
+    
+    LAYOUT = (
+        ('amount', 'Q'),
+        ('other_amount_threshold', 'Q'),
+        ('sqrt_price_limit_x64_lo', 'Q'),
+        ('sqrt_price_limit_x64_hi', 'Q'),
+        ('is_base_input', 'B')
+    )
     
     # Constants
     TICK_SPACING_STABLE = 1  # For stable pairs
@@ -43,8 +59,13 @@ class RaydiumCLMMParser(BaseDEXParser):
             if not clmm_ix:
                 return None
                 
+            # Skip non-swap instructions before decoding
+            raw_data = clmm_ix.get('data', '')
+            if not self.has_swap_discriminator(raw_data):
+                return None
+                
             # Decode instruction data
-            data = b64decode(clmm_ix.get('data', ''))
+            data = b64decode(raw_data)
             if len(data) < 8:
                 return None
                 
@@ -56,21 +77,20 @@ class RaydiumCLMMParser(BaseDEXParser):
             # Parse swap instruction data
             # Layout: discriminator (8) + amount (8) + other_amount_threshold (8) + 
             #         sqrt_price_limit_x64 (16) + is_base_input (1)
-            if len(data) < 41:
-                logger.error(f"Invalid CLMM swap data length: {len(data)}")
+            if len(data) < self.LAYOUT_SIZE:
+                logger.error("Invalid CLMM swap data length: %d", len(data))
                 return None
                 
-            amount = struct.unpack('<Q', data[8:16])[0]
-            other_amount_threshold = struct.unpack('<Q', data[16:24])[0]
-            sqrt_price_limit_x64 = struct.unpack('<Q', data[24:32])[0] + (struct.unpack('<Q', data[32:40])[0] << 64)
-            is_base_input = data[40] == 1
+            amount, other_amount_threshold, sqrt_lo, sqrt_hi, base_input_flag = self._decode(data)
+            sqrt_price_limit_x64 = sqrt_lo + (sqrt_hi << 64)
+            is_base_input = base_input_flag == 1
             
             # Parse accounts
             # [tokenProgram, tokenAuthority, ammConfig, poolState, tokenVault0, tokenVault1, 
             #  observationState, userTokenAccount0, userTokenAccount1, userAccount]
             accounts = clmm_ix.get('accounts', [])
             if len(accounts) < 10:
-                logger.error(f"Insufficient CLMM accounts: {len(accounts)}")
+                logger.error("Insufficient CLMM accounts: %d", len(accounts))
                 return None
                 
             pool_state = accounts[3]
@@ -106,14 +126,13 @@ class RaydiumCLMMParser(BaseDEXParser):
             
             return result
             
-        except Exception as e:
-            logger.error(f"Error parsing CLMM transaction {tx.get('signature')}: {e}")
+        except Exception:
+            logger.exception("Error parsing CLMM transaction %s", tx.get('signature'))
             return None
             
     def _determine_token_info(self, transfers: list, user_address: str) -> Dict:
         """Determine token mint and amounts from transfers"""
         
-        sol_mint = 'So11111111111111111111111111111111111111112'
         token_mint = None
         token_amount = 0
         sol_amount = 0
@@ -121,31 +140,26 @@ class RaydiumCLMMParser(BaseDEXParser):
         
         for transfer in transfers:
             mint = transfer.get('mint')
-            source = transfer.get('source')
-            destination = transfer.get('destination')
-            amount = int(transfer.get('amount', 0))
-            decimals = transfer.get('decimals', 9)
+            route = TRANSFER_ROUTES[
+                (transfer.get('source') == user_address) << 2
+                | (transfer.get('destination') == user_address) << 1
+                | (mint == SOL_MINT)
+            ]
             
-            if mint == sol_mint:
-                # SOL transfer
-                if source == user_address:
-                    # User sending SOL = buying token
-                    sol_amount = amount / 1e9
-                    is_buy = True
-                elif destination == user_address:
-                    # User receiving SOL = selling token
-                    sol_amount = amount / 1e9
-                    is_buy = False
+            if route == ROUTE_NONE:
+                continue
+            if route == ROUTE_SOL_OUT:
+                # User sending SOL = buying token
+                sol_amount = transfer['amount'] / 1e9
+                is_buy = True
+            elif route == ROUTE_SOL_IN:
+                # User receiving SOL = selling token
+                sol_amount = transfer['amount'] / 1e9
+                is_buy = False
             else:
-                # Token transfer
-                if destination == user_address:
-                    # User receiving token = buying
-                    token_mint = mint
-                    token_amount = amount / (10 ** decimals)
-                elif source == user_address:
-                    # User sending token = selling
-                    token_mint = mint
-                    token_amount = amount / (10 ** decimals)
+                # Token received (buy) or sent (sell)
+                token_mint = mint
+                token_amount = transfer['amount'] / (10 ** transfer['decimals'])
                     
         return {
             'token_mint': token_mint,
@@ -1,9 +1,17 @@
 from base64 import b64decode
-import struct
 from typing import Dict, Optional
 import logging
 
-from .dex_base import BaseDEXParser
+from .dex_base import (
+    BaseDEXParser,
+    b64_prefix,
+    SOL_MINT,
+    TRANSFER_ROUTES,
+    ROUTE_SOL_IN,
+    ROUTE_SOL_OUT,
+    ROUTE_TOKEN_IN,
+    ROUTE_TOKEN_OUT
+)
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +22,12 @@ class RaydiumCPMMParser(BaseDEXParser):
     # Swap instruction discriminators
     SWAP_BASE_IN_DISCRIMINATOR = bytes([0x8f, 0x9a, 0xd9, 0x48, 0xe6, 0xfb, 0x0a, 0xfa])
     SWAP_BASE_OUT_DISCRIMINATOR = bytes([0x6f, 0x48, 0x7a, 0x0f, 0x96, 0xd8, 0x31, 0xfe])
+    DISCRIMINATOR_PREFIXES = (
+        b64_prefix(SWAP_BASE_IN_DISCRIMINATOR),
+        b64_prefix(SWAP_BASE_OUT_DISCRIMINATOR)
+    )
+    
+    LAYOUT = (('amount_in', 'Q'), ('minimum_amount_out', 'Q'))
     
     # Standard fee rate
     FEE_RATE = 0.0025  # 0.25%
@@ -41,8 +55,13 @@ class RaydiumCPMMParser(BaseDEXParser):
             if not cpmm_ix:
                 return None
                 
+            # Skip non-swap instructions before decoding
+            raw_data = cpmm_ix.get('data', '')
+            if not self.has_swap_discriminator(raw_data):
+                return None
+                
             # Decode instruction data
-            data = b64decode(cpmm_ix.get('data', ''))
+            data = b64decode(raw_data)
             if len(data) < 8:
                 return None
                 
@@ -55,17 +74,17 @@ class RaydiumCPMMParser(BaseDEXParser):
             elif discriminator == self.SWAP_BASE_OUT_DISCRIMINATOR:
                 is_base_in = False
             else:
-                logger.debug(f"Unknown CPMM discriminator: {discriminator.hex()}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Unknown CPMM discriminator: %s", discriminator.hex())
                 return None
                 
             # Parse swap amounts
             # Layout: discriminator (8) + amount_in (8) + minimum_amount_out (8)
-            if len(data) < 24:
-                logger.error(f"Invalid CPMM swap data length: {len(data)}")
+            if len(data) < self.LAYOUT_SIZE:
+                logger.error("Invalid CPMM swap data length: %d", len(data))
                 return None
                 
-            amount_in = struct.unpack('<Q', data[8:16])[0]
-            minimum_amount_out = struct.unpack('<Q', data[16:24])[0]
+            amount_in, minimum_amount_out = self._decode(data)
             
             # Parse accounts
             # Account layout varies but typically includes:
@@ -73,7 +92,7 @@ class RaydiumCPMMParser(BaseDEXParser):
             #  inputTokenProgram, outputTokenProgram, inputTokenAccount, outputTokenAccount, ...]
             accounts = cpmm_ix.get('accounts', [])
             if len(accounts) < 9:
-                logger.error(f"Insufficient CPMM accounts: {len(accounts)}")
+                logger.error("Insufficient CPMM accounts: %d", len(accounts))
                 return None
                 
             authority = accounts[0]
@@ -117,8 +136,8 @@ class RaydiumCPMMParser(BaseDEXParser):
             
             return result
             
-        except Exception as e:
-            logger.error(f"Error parsing CPMM transaction {tx.get('signature')}: {e}")
+        except Exception:
+            logger.exception("Error parsing CPMM transaction %s", tx.get('signature'))
             return None
             
     def _determine_token_info_from_transfers(
@@ -130,46 +149,45 @@ class RaydiumCPMMParser(BaseDEXParser):
     ) -> Dict:
         """Determine token information from transfers and vaults"""
         
-        sol_mint = 'So11111111111111111111111111111111111111112'
         token_mint = None
         token_amount = 0
         sol_amount = 0
         is_buy = None
         decimals = 9
+        vaults = (input_vault, output_vault)
         
         for transfer in transfers:
             mint = transfer.get('mint')
             source = transfer.get('source')
             destination = transfer.get('destination')
-            amount = int(transfer.get('amount', 0))
-            transfer_decimals = transfer.get('decimals', 9)
             
             # Check if this transfer involves the pool vaults
-            involves_pool = source in [input_vault, output_vault] or destination in [input_vault, output_vault]
-            
-            if not involves_pool:
+            if source not in vaults and destination not in vaults:
                 continue
                 
-            if mint == sol_mint:
-                # SOL transfer
-                if source == user_address or destination == output_vault:
-                    # User sending SOL or SOL going to output vault = buying token
-                    sol_amount = amount / 1e9
-                    is_buy = True
-                elif destination == user_address or source == output_vault:
-                    # User receiving SOL or SOL coming from output vault = selling token
-                    sol_amount = amount / 1e9
-                    is_buy = False
-            else:
+            # SOL moves through the output vault, tokens through the input vault
+            is_sol = mint == SOL_MINT
+            vault = output_vault if is_sol else input_vault
+            route = TRANSFER_ROUTES[
+                (source == user_address or destination == vault) << 2
+                | (destination == user_address or source == vault) << 1
+                | is_sol
+            ]
+            
+            if route == ROUTE_SOL_OUT:
+                # User sending SOL or SOL going to output vault = buying token
+                sol_amount = transfer['amount'] / 1e9
+                is_buy = True
+            elif route == ROUTE_SOL_IN:
+                # User receiving SOL or SOL coming from output vault = selling token
+                sol_amount = transfer['amount'] / 1e9
+                is_buy = False
+            elif not is_sol:
                 # Token transfer
                 token_mint = mint
-                decimals = transfer_decimals
-                if destination == user_address or source == input_vault:
-                    # User receiving token or token coming from input vault = buying
-                    token_amount = amount / (10 ** decimals)
-                elif source == user_address or destination == input_vault:
-                    # User sending token or token going to input vault = selling
-                    token_amount = amount / (10 ** decimals)
+                decimals = transfer['decimals']
+                if route == ROUTE_TOKEN_IN or route == ROUTE_TOKEN_OUT:
+                    token_amount = transfer['amount'] / (10 ** decimals)
                     
         return {
             'token_mint': token_mint,
@@ -2,7 +2,7 @@ from .detector import SignalDetector
 from .flexible_detector import FlexibleSignalDetector
 from .backtest import BacktestEngine
 from .simulator import TradeSimulator
-from .metrics import MetricsCalculator
+from .metrics import MetricsCalculator, TradeArray, prepare_trade_views
 from .job_manager import BacktestJobManager, BacktestJobExecutor, JobStatus
 
 __all__ = [
@@ -11,6 +11,8 @@ __all__ = [
     "BacktestEngine",
     "TradeSimulator",
     "MetricsCalculator",
+    "TradeArray",
+    "prepare_trade_views",
     "BacktestJobManager",
     "BacktestJobExecutor",
     "JobStatus"
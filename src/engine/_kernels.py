@@ -0,0 +1,315 @@
+import numpy as np
+import pandas as pd
+from numba import njit
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+
+# Pool states further than this from a transaction are ignored
+POOL_STATE_TOLERANCE_NS = 300 * 1_000_000_000
+
+# Column order of the running window totals kept by scan_signals
+WINDOW_METRICS = (
+    'total_volume',
+    'buy_volume',
+    'sell_volume',
+    'buy_count',
+    'sell_count',
+    'large_buy_count',
+    'large_buy_volume'
+)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def parse_timestamps(values: List[Any]) -> np.ndarray:
+    """Parse datetimes and ISO strings into int64 epoch nanoseconds, treating naive values as UTC"""
+    
+    if not values:
+        return np.empty(0, dtype=np.int64)
+    return pd.to_datetime(values, utc=True, format='ISO8601').as_unit('ns').asi8
+
+
+def transaction_arrays(transactions: List[Dict]) -> Dict[str, np.ndarray]:
+    """Read each transaction's amount and type once into amount_usd, is_buy and is_sell arrays"""
+    
+    tx_types = np.array([tx.get('type') for tx in transactions], dtype=object)
+    return {
+        'amount_usd': np.array([tx.get('amount_usd', 0) for tx in transactions], dtype=np.float64),
+        'is_buy': tx_types == 'buy',
+        'is_sell': tx_types == 'sell'
+    }
+
+
+def sort_by_time(timestamps_ns: np.ndarray, items: List[Any]) -> Tuple[np.ndarray, List[Any]]:
+    """Stable-sort items by their epoch-ns timestamps, skipping the sort when already in order"""
+    
+    if np.all(timestamps_ns[1:] >= timestamps_ns[:-1]):
+        return timestamps_ns, items
+        
+    order = np.argsort(timestamps_ns, kind='stable')
+    return timestamps_ns[order], [items[i] for i in order]
+
+
+def from_epoch_ns(timestamp_ns: int) -> datetime:
+    """UTC datetime for an epoch-nanosecond timestamp"""
+    return _EPOCH + timedelta(microseconds=timestamp_ns // 1000)
+
+
+@njit(cache=True, nogil=True)
+def closest_index(sorted_ts: np.ndarray, ts: int, tolerance: int) -> int:
+    """Index of the entry closest to ts (the earlier one on ties), or -1 if none is within tolerance"""
+    
+    right = np.searchsorted(sorted_ts, ts)
+    best = -1
+    best_gap = tolerance + 1
+    
+    if right > 0:
+        best_gap = ts - sorted_ts[right - 1]
+        best = right - 1
+    if right < sorted_ts.shape[0] and sorted_ts[right] - ts < best_gap:
+        best_gap = sorted_ts[right] - ts
+        best = right
+        
+    if best_gap > tolerance:
+        return -1
+    return best
+
+
+@njit('int64[:](int64[:], int64[:], int64)', cache=True, nogil=True)
+def closest_indices(sorted_ts: np.ndarray, ts: np.ndarray, tolerance: int) -> np.ndarray:
+    """closest_index for every entry of ts"""
+    
+    out = np.empty(ts.shape[0], dtype=np.int64)
+    for i in range(ts.shape[0]):
+        out[i] = closest_index(sorted_ts, ts[i], tolerance)
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _accumulate(totals: np.ndarray, amount: float, is_buy: bool, is_sell: bool, thresh: float, sign: float):
+    """Add (sign=1) or remove (sign=-1) one transaction from the running window totals"""
+    
+    totals[0] += sign * amount
+    if is_buy:
+        totals[1] += sign * amount
+        totals[3] += sign
+        if amount >= thresh:
+            totals[5] += sign
+            totals[6] += sign * amount
+    elif is_sell:
+        totals[2] += sign * amount
+        totals[4] += sign
+
+
+@njit(
+    'Tuple((int64[:], int64[:], int64[:], float64[:, :]))('
+    'int64[:], float64[:], bool_[:], bool_[:], int64, float64, int64, '
+    'float64, float64, float64, int64[:], float64[:], float64[:])',
+    cache=True,
+    nogil=True
+)
+def scan_signals(
+    ts_ns: np.ndarray,
+    amt: np.ndarray,
+    is_buy: np.ndarray,
+    is_sell: np.ndarray,
+    window_ns: int,
+    thresh: float,
+    min_large: int,
+    min_vol: float,
+    min_liq: float,
+    max_mc: float,
+    pool_ts: np.ndarray,
+    pool_liq: np.ndarray,
+    pool_mc: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Slide a trailing time window over sorted transactions and flag signals
+    
+    Window totals are updated as transactions enter and leave, and the window
+    is emptied after every signal so the same transactions never trigger twice.
+    
+    Returns:
+        (signal_indices, pool_indices, window_sizes, window_totals), where each
+        window_totals row holds the WINDOW_METRICS of that signal's window
+    """
+    
+    n = ts_ns.shape[0]
+    signals = np.empty(n, dtype=np.int64)
+    pools = np.empty(n, dtype=np.int64)
+    sizes = np.empty(n, dtype=np.int64)
+    window_totals = np.empty((n, len(WINDOW_METRICS)), dtype=np.float64)
+    totals = np.zeros(len(WINDOW_METRICS), dtype=np.float64)
+    count = 0
+    lo = 0
+    
+    for i in range(n):
+        _accumulate(totals, amt[i], is_buy[i], is_sell[i], thresh, 1.0)
+        
+        # Drop transactions that fell out of the window
+        cutoff = ts_ns[i] - window_ns
+        while ts_ns[lo] < cutoff:
+            _accumulate(totals, amt[lo], is_buy[lo], is_sell[lo], thresh, -1.0)
+            lo += 1
+            
+        if totals[0] < min_vol or totals[5] < min_large:
+            continue
+            
+        p = closest_index(pool_ts, ts_ns[i], POOL_STATE_TOLERANCE_NS)
+        if p < 0 or pool_liq[p] < min_liq or pool_mc[p] > max_mc:
+            continue
+            
+        signals[count] = i
+        pools[count] = p
+        sizes[count] = i + 1 - lo
+        window_totals[count] = totals
+        count += 1
+        
+        # Clear window to avoid duplicate signals
+        lo = i + 1
+        totals[:] = 0.0
+        
+    return signals[:count], pools[:count], sizes[:count], window_totals[:count]
+
+
+@njit(cache=True, nogil=True, error_model='numpy')
+def drawdown_stats(values: np.ndarray, compound: bool) -> Tuple[float, float, int, int, float]:
+    """
+    Single pass over an equity curve, or over per-trade returns compounded
+    into one when compound is set
+    
+    Returns:
+        (final_equity, max_drawdown, start_idx, end_idx, sum_squared_drawdowns),
+        where max_drawdown is a positive fraction (NaN once any drawdown is
+        NaN, as with np.min), end_idx is the first point at the deepest
+        drawdown and start_idx the last peak before it
+    """
+    
+    equity = 1.0
+    peak = -np.inf
+    peak_idx = 0
+    max_dd = 0.0
+    start_idx = 0
+    end_idx = 0
+    sum_sq = 0.0
+    
+    for i in range(values.shape[0]):
+        if compound:
+            equity *= 1 + values[i]
+        else:
+            equity = values[i] * 1.0
+        if equity >= peak:
+            peak = equity
+            peak_idx = i
+            
+        dd = (equity - peak) / peak
+        sum_sq += dd * dd
+        if dd < -max_dd or np.isnan(dd):
+            max_dd = -dd
+            start_idx = peak_idx
+            end_idx = i
+            
+    return equity, max_dd, start_idx, end_idx, sum_sq
+
+
+@njit(cache=True, nogil=True)
+def moments(data: np.ndarray) -> Tuple[float, float, float, float]:
+    """
+    Mean, population std, skewness and excess kurtosis in one streaming pass
+    (Welford/Pebay updates). Skewness needs 3 values and kurtosis 4, and
+    both are 0 below that or when the data is constant.
+    """
+    
+    n = 0
+    mean = m2 = m3 = m4 = 0.0
+    
+    for i in range(data.shape[0]):
+        n1 = n
+        n += 1
+        delta = data[i] - mean
+        delta_n = delta / n
+        delta_n2 = delta_n * delta_n
+        term = delta * delta_n * n1
+        mean += delta_n
+        m4 += term * delta_n2 * (n * n - 3 * n + 3) + 6 * delta_n2 * m2 - 4 * delta_n * m3
+        m3 += term * delta_n * (n - 2) - 3 * delta_n * m2
+        m2 += term
+        
+    if n == 0:
+        return 0.0, 0.0, 0.0, 0.0
+        
+    std = np.sqrt(m2 / n)
+    skewness = np.sqrt(n) * m3 / m2 ** 1.5 if n >= 3 and m2 > 0 else 0.0
+    kurtosis = n * m4 / (m2 * m2) - 3 if n >= 4 and m2 > 0 else 0.0
+    
+    return mean, std, skewness, kurtosis
+
+
+@njit(cache=True, nogil=True)
+def downside_moments(returns: np.ndarray) -> Tuple[float, float, int, float]:
+    """
+    Mean and population std of returns, plus the count and population std of
+    the negative returns alone, in one Welford pass
+    """
+    
+    n = n_down = 0
+    mean = m2 = 0.0
+    down_mean = down_m2 = 0.0
+    
+    for i in range(returns.shape[0]):
+        r = returns[i]
+        n += 1
+        delta = r - mean
+        mean += delta / n
+        m2 += delta * (r - mean)
+        
+        if r < 0:
+            n_down += 1
+            delta = r - down_mean
+            down_mean += delta / n_down
+            down_m2 += delta * (r - down_mean)
+            
+    std = np.sqrt(m2 / n) if n > 0 else 0.0
+    down_std = np.sqrt(down_m2 / n_down) if n_down > 0 else 0.0
+    
+    return mean, std, n_down, down_std
+
+
+@njit(cache=True, nogil=True)
+def gain_loss_sums(values: np.ndarray, threshold: float) -> Tuple[float, float]:
+    """Total excess above threshold and total shortfall at or below it, both positive"""
+    
+    gains = losses = 0.0
+    for i in range(values.shape[0]):
+        if values[i] > threshold:
+            gains += values[i] - threshold
+        else:
+            losses += threshold - values[i]
+    return gains, losses
+
+
+@njit(cache=True, nogil=True)
+def longest_drawdown(returns: np.ndarray, timestamps: np.ndarray) -> int:
+    """
+    Longest time the compounded returns spent below their running peak, in the
+    units of timestamps (point i is reached at timestamps[i])
+    """
+    
+    equity = 1.0
+    peak = -np.inf
+    start = 0
+    in_drawdown = False
+    longest = 0
+    
+    for i in range(returns.shape[0]):
+        equity *= 1 + returns[i]
+        if equity < peak:
+            if not in_drawdown:
+                start = timestamps[i]
+                in_drawdown = True
+            longest = max(longest, timestamps[i] - start)
+        else:
+            peak = equity
+            in_drawdown = False
+            
+    return longest
@@ -1,20 +1,26 @@
 """Main backtesting engine with realistic trade simulation"""
 
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Callable
 from datetime import datetime, timedelta, timezone
 import asyncio
 import asyncpg
 import logging
+import time
 import numpy as np
-import json
 import operator
-from collections import defaultdict
+from base64 import b64encode, b64decode
+from collections import defaultdict, OrderedDict
 
 from src.api import HeliusClient, BirdeyeClient, APICache
 from src.services import TokenAgeTracker
 from src.strategies import StrategyManager
 from src.dex import get_dex_parser, SUPPORTED_DEXES
-from src.utils import calculate_trade_metrics, decimal_handler
+from src.utils import (
+    calculate_trade_metrics,
+    decimal_handler,
+    max_streaks,
+    equity_curve_stats
+)
 from .flexible_detector import FlexibleSignalDetector
 
 logger = logging.getLogger(__name__)
@@ -23,13 +29,17 @@ logger = logging.getLogger(__name__)
 class BacktestEngine:
     """Production backtesting engine with realistic execution simulation"""
     
+    # Multiplier converting an age in hours into each supported unit
+    AGE_UNIT_MULTIPLIERS = {'days': 1 / 24, 'minutes': 60}
+    
     def __init__(
         self,
         helius_client: HeliusClient,
         birdeye_client: BirdeyeClient,
         db_pool: asyncpg.Pool,
         redis_client: Any,
-        config: Optional[Dict] = None
+        config: Optional[Dict] = None,
+        strategy_manager: Optional[StrategyManager] = None
     ):
         self.helius = helius_client
         self.birdeye = birdeye_client
@@ -48,7 +58,10 @@ class BacktestEngine:
             'hold_duration': 300,     # 5 minutes default hold
             'exit_strategy': 'time_based',  # time_based, stop_loss_take_profit, trailing_stop
             'execution_delay': 2,     # 2 seconds execution delay
-            'max_concurrent_positions': 10
+            'max_concurrent_positions': 10,
+            'max_concurrent_tokens': 8,  # Tokens fetched/processed in parallel
+            'price_cache_size': 256,     # Tokens' price arrays kept in process
+            'require_creation_time': True  # Skip tokens with unknown/later creation
         }
         
         if config:
@@ -56,9 +69,19 @@ class BacktestEngine:
             
         # Initialize services
         self.token_tracker = TokenAgeTracker(helius_client, birdeye_client, db_pool, redis_client)
-        self.strategy_manager = StrategyManager(db_pool)
+        # Share the API's manager when given so strategy edits invalidate its cache
+        self.strategy_manager = strategy_manager or StrategyManager(db_pool)
         self.cache = APICache()
         
+        # In-process LRU of deserialized price arrays, keyed like the Redis cache
+        self._price_cache: OrderedDict = OrderedDict()
+        
+        # One parser per supported program, keyed for O(1) instruction dispatch
+        self._program_to_parser = {
+            program_id: get_dex_parser(program_id)
+            for program_id in SUPPORTED_DEXES.values()
+        }
+        
     async def run_backtest(
         self,
         strategy_id: int,
@@ -76,59 +99,85 @@ class BacktestEngine:
         if not strategy:
             raise ValueError(f"Strategy {strategy_id} not found")
             
-        # Create backtest record
-        backtest_id = await self._create_backtest_record(
-            strategy_id,
-            start_date,
-            end_date
-        )
+        # Create backtest record; connections are only held for bookkeeping
+        # statements so the concurrent per-token phase can use the whole pool
+        async with self.db.acquire() as conn:
+            backtest_id = await self._create_backtest_record(
+                conn,
+                strategy_id,
+                start_date,
+                end_date
+            )
         
         try:
             # Update status
-            await self._update_backtest_status(backtest_id, 'running')
+            async with self.db.acquire() as conn:
+                await self._update_backtest_status(conn, backtest_id, 'running')
             
             # Initialize detector
             detector = FlexibleSignalDetector(strategy, self.token_tracker)
+            age_requirement = self._token_age_requirement(strategy)
             
-            # Process each token
-            all_signals = []
-            all_trades = []
+            # Resolve eligibility for every token up front in one batch
+            eligible_tokens = await self._eligible_tokens(
+                token_addresses,
+                start_date,
+                age_requirement
+            )
             
-            for i, token_address in enumerate(token_addresses):
-                logger.info(f"Processing token {i+1}/{len(token_addresses)}: {token_address}")
-                
-                # Check token age first
-                if not await self._is_token_eligible(token_address, start_date, strategy):
-                    logger.info(f"Token {token_address} not eligible, skipping")
-                    continue
+            # Process tokens concurrently, bounded so DB/API load stays predictable
+            semaphore = asyncio.Semaphore(self.config['max_concurrent_tokens'])
+            
+            async def process_token(i: int, token_address: str) -> Tuple[List[Dict], List[Dict]]:
+                async with semaphore:
+                    logger.info(f"Processing token {i+1}/{len(token_addresses)}: {token_address}")
                     
-                # Fetch data
-                token_data = await self._fetch_token_data(
-                    token_address,
-                    start_date,
-                    end_date
-                )
-                
-                if not token_data['transactions']:
-                    logger.warning(f"No transactions found for {token_address}")
-                    continue
+                    # Check token age first
+                    if token_address not in eligible_tokens:
+                        logger.info(f"Token {token_address} not eligible, skipping")
+                        return [], []
+                        
+                    # Fetch data
+                    token_data = await self._fetch_token_data(
+                        token_address,
+                        start_date,
+                        end_date
+                    )
                     
-                # Detect signals
-                signals = await detector.detect_signals(
-                    token_data['transactions'],
-                    token_data['pool_states'],
-                    token_address
-                )
-                
+                    if not token_data['transactions']:
+                        logger.warning(f"No transactions found for {token_address}")
+                        return [], []
+                        
+                    # Detect signals
+                    signals = await detector.detect_signals(
+                        token_data['transactions'],
+                        token_data['pool_states'],
+                        token_address
+                    )
+                    
+                    # Simulate trades
+                    trades = await self._simulate_trades(
+                        signals,
+                        token_address,
+                        token_data['price_data']
+                    )
+                    
+                    return signals, trades
+                    
+            results = await asyncio.gather(
+                *(process_token(i, address) for i, address in enumerate(token_addresses)),
+                return_exceptions=True
+            )
+            
+            all_signals = []
+            all_trades = []
+            
+            for result in results:
+                # Fail the backtest on the first token error, as the serial loop did
+                if isinstance(result, BaseException):
+                    raise result
+                signals, trades = result
                 all_signals.extend(signals)
-                
-                # Simulate trades
-                trades = await self._simulate_trades(
-                    signals,
-                    token_address,
-                    token_data['price_data']
-                )
-                
                 all_trades.extend(trades)
                 
             # Calculate portfolio metrics
@@ -137,16 +186,19 @@ class BacktestEngine:
                 initial_capital
             )
             
-            # Store results
-            await self._store_backtest_results(
-                backtest_id,
-                all_signals,
-                all_trades,
-                portfolio_metrics
-            )
-            
-            # Update status
-            await self._update_backtest_status(backtest_id, 'completed')
+            # Store results and mark completed atomically
+            async with self.db.acquire() as conn:
+                async with conn.transaction():
+                    await self._store_backtest_results(
+                        conn,
+                        backtest_id,
+                        all_signals,
+                        all_trades,
+                        portfolio_metrics
+                    )
+                    
+                    # Update status
+                    await self._update_backtest_status(conn, backtest_id, 'completed')
             
             logger.info(f"Backtest {backtest_id} completed successfully")
             
@@ -166,9 +218,10 @@ class BacktestEngine:
             
         except Exception as e:
             logger.error(f"Backtest failed: {e}")
-            await self._update_backtest_status(backtest_id, 'failed', str(e))
+            async with self.db.acquire() as conn:
+                await self._update_backtest_status(conn, backtest_id, 'failed', str(e))
             raise
-            
+        
     async def _fetch_token_data(
         self,
         token_address: str,
@@ -177,43 +230,45 @@ class BacktestEngine:
     ) -> Dict[str, Any]:
         """Fetch all required data for a token"""
         
-        # Fetch transactions from database first
-        transactions = await self._fetch_transactions_from_db(
-            token_address,
-            start_date,
-            end_date
+        # Pool states and price data don't depend on transactions; start them now
+        pool_task = asyncio.create_task(
+            self._fetch_pool_states(token_address, start_date, end_date)
+        )
+        price_task = asyncio.create_task(
+            self._fetch_price_data(token_address, start_date, end_date)
         )
         
-        # If not enough data, fetch from API
-        if len(transactions) < 100:  # Arbitrary threshold
-            logger.info(f"Fetching additional data from API for {token_address}")
-            api_transactions = await self.helius.get_token_transactions(
+        try:
+            # Fetch transactions from database first
+            transactions = await self._fetch_transactions_from_db(
                 token_address,
                 start_date,
                 end_date
             )
             
-            # Parse and store transactions
-            parsed_txs = await self._parse_and_store_transactions(
-                api_transactions,
-                token_address
-            )
-            transactions.extend(parsed_txs)
+            # If not enough data, fetch from API
+            if len(transactions) < 100:  # Arbitrary threshold
+                logger.info(f"Fetching additional data from API for {token_address}")
+                api_transactions = await self.helius.get_token_transactions(
+                    token_address,
+                    start_date,
+                    end_date
+                )
+                
+                # Parse and store transactions
+                parsed_txs = await self._parse_and_store_transactions(
+                    api_transactions,
+                    token_address
+                )
+                transactions.extend(parsed_txs)
+                
+            pool_states, price_data = await asyncio.gather(pool_task, price_task)
+            
+        except BaseException:
+            pool_task.cancel()
+            price_task.cancel()
+            raise
             
-        # Fetch pool states
-        pool_states = await self._fetch_pool_states(
-            token_address,
-            start_date,
-            end_date
-        )
-        
-        # Fetch price data for exit simulation
-        price_data = await self._fetch_price_data(
-            token_address,
-            start_date,
-            end_date
-        )
-        
         return {
             'transactions': transactions,
             'pool_states': pool_states,
@@ -225,8 +280,12 @@ class BacktestEngine:
         token_address: str,
         start_date: datetime,
         end_date: datetime
-    ) -> List[Dict]:
-        """Fetch transactions from database"""
+    ) -> List[asyncpg.Record]:
+        """Fetch transactions from database
+        
+        Records are returned as-is; they support the same ``[]``/``.get()``
+        access the detectors use, so no per-row dict is materialized.
+        """
         
         async with self.db.acquire() as conn:
             rows = await conn.fetch("""
@@ -246,7 +305,7 @@ class BacktestEngine:
                 ORDER BY time
             """, token_address, start_date, end_date)
             
-        return [dict(row) for row in rows]
+        return rows
         
     async def _parse_and_store_transactions(
         self,
@@ -260,9 +319,9 @@ class BacktestEngine:
         for tx in raw_transactions:
             # Determine DEX
             dex_parser = None
-            for program_id in SUPPORTED_DEXES.values():
-                if any(ix.get('programId') == program_id for ix in tx.get('instructions', [])):
-                    dex_parser = get_dex_parser(program_id)
+            for ix in tx.get('instructions') or ():
+                dex_parser = self._program_to_parser.get(ix.get('programId'))
+                if dex_parser is not None:
                     break
                     
             if not dex_parser:
@@ -273,9 +332,10 @@ class BacktestEngine:
             if parsed and parsed.get('token_address') == token_address:
                 parsed_txs.append(parsed)
                 
-                # Store in database
-                await self._store_transaction(parsed)
-                
+        # Store in database in a single batch
+        if parsed_txs:
+            await self._store_transactions(parsed_txs)
+            
         return parsed_txs
         
     async def _fetch_pool_states(
@@ -312,14 +372,23 @@ class BacktestEngine:
         token_address: str,
         start_date: datetime,
         end_date: datetime
-    ) -> Dict[datetime, float]:
-        """Fetch minute-level price data"""
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Fetch minute-level price data as sorted (epoch seconds, price) arrays"""
         
-        # Try cache first
         cache_key = f"price_data:{token_address}:{start_date.date()}:{end_date.date()}"
+        
+        # Reuse arrays already deserialized by this process (e.g. across strategies)
+        entry = self._price_cache.get(cache_key)
+        if entry and entry[0] > time.monotonic():
+            self._price_cache.move_to_end(cache_key)
+            return entry[1]
+            
+        # Try cache first
         cached = await self.redis.get(cache_key)
         if cached:
-            return {datetime.fromisoformat(k): v for k, v in cached.items()}
+            price_arrays = self._unpack_price_arrays(cached)
+            self._remember_price_arrays(cache_key, price_arrays)
+            return price_arrays
             
         # Fetch from Birdeye
         ohlcv_data = await self.birdeye.get_ohlcv(
@@ -329,36 +398,102 @@ class BacktestEngine:
             interval="1m"
         )
         
-        # Convert to price dict
-        price_data = {}
-        for candle in ohlcv_data:
-            timestamp = datetime.fromtimestamp(candle['unixTime'], tz=timezone.utc)
-            price_data[timestamp] = candle['c']  # Close price
-            
+        # Close prices straight into (epoch seconds, price) arrays
+        price_arrays = self._ohlcv_to_price_arrays(ohlcv_data)
+        
         # Cache for future use
         await self.redis.setex(
             cache_key,
             3600,  # 1 hour cache
-            {k.isoformat(): v for k, v in price_data.items()}
+            self._pack_price_arrays(price_arrays)
         )
+        self._remember_price_arrays(cache_key, price_arrays)
+        
+        return price_arrays
+        
+    def _remember_price_arrays(
+        self,
+        cache_key: str,
+        price_arrays: Tuple[np.ndarray, np.ndarray]
+    ):
+        """Keep price arrays in the in-process LRU, expiring with the Redis entry"""
         
-        return price_data
+        # Shared between callers, so guard against in-place modification
+        for array in price_arrays:
+            array.flags.writeable = False
+            
+        self._price_cache[cache_key] = (time.monotonic() + 3600, price_arrays)
+        self._price_cache.move_to_end(cache_key)
+        
+        while len(self._price_cache) > self.config['price_cache_size']:
+            self._price_cache.popitem(last=False)
+        
+    @staticmethod
+    def _pack_price_arrays(price_arrays: Tuple[np.ndarray, np.ndarray]) -> str:
+        """Serialize price arrays as base64 of raw little-endian int64 + float64 buffers"""
+        
+        timestamps, prices = price_arrays
+        payload = timestamps.astype('<i8').tobytes() + prices.astype('<f8').tobytes()
+        
+        # The shared Redis client decodes responses, so the payload must be text
+        return b64encode(payload).decode('ascii')
+        
+    @staticmethod
+    def _unpack_price_arrays(cached: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Inverse of _pack_price_arrays"""
+        
+        payload = b64decode(cached)
+        count = len(payload) // 16
+        timestamps = np.frombuffer(payload, dtype='<i8', count=count)
+        prices = np.frombuffer(payload, dtype='<f8', count=count, offset=count * 8)
+        
+        return timestamps, prices
         
     async def _simulate_trades(
         self,
         signals: List[Dict],
         token_address: str,
-        price_data: Dict[datetime, float]
+        price_arrays: Tuple[np.ndarray, np.ndarray]
     ) -> List[Dict]:
         """Simulate trade execution with realistic conditions"""
         
         trades = []
         
-        for signal in signals:
-            trade = await self._simulate_single_trade(
-                signal,
+        # Entry prices, liquidity filter and position sizes for all signals at once
+        base_prices = np.fromiter(
+            (signal['pool_state'].get('price', 0) for signal in signals),
+            dtype=np.float64,
+            count=len(signals)
+        )
+        liquidity = np.fromiter(
+            (signal['pool_state'].get('liquidity_usd', 0) for signal in signals),
+            dtype=np.float64,
+            count=len(signals)
+        )
+        
+        # Skip signals without a price or below the pool liquidity floor
+        tradable = (base_prices != 0) & (liquidity >= self.config['min_liquidity'])
+        entry_prices = base_prices * (1 + self.config['entry_slippage'])
+        
+        # Calculate position size (respecting max % of pool), default $1000 position
+        position_sizes = np.minimum(1000.0, liquidity * self.config['max_position_size'])
+        
+        # Entry times as epoch seconds; datetimes are only built for the trade record
+        entry_timestamps = np.fromiter(
+            (int(signal['timestamp'].timestamp()) for signal in signals),
+            dtype=np.int64,
+            count=len(signals)
+        ) + int(self.config['execution_delay'])
+        
+        for i in np.flatnonzero(tradable):
+            trade = self._simulate_single_trade(
+                signals[i],
                 token_address,
-                price_data
+                int(entry_timestamps[i]),
+                float(entry_prices[i]),
+                float(liquidity[i]),
+                float(position_sizes[i]),
+                price_arrays
             )
             
             if trade:
@@ -366,39 +501,46 @@ class BacktestEngine:
                 
         return trades
         
-    async def _simulate_single_trade(
+    @staticmethod
+    def _ohlcv_to_price_arrays(ohlcv_data: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+        """Convert OHLCV candles to sorted (epoch seconds, close price) arrays"""
+        
+        timestamps = np.fromiter(
+            (candle['unixTime'] for candle in ohlcv_data), dtype=np.int64, count=len(ohlcv_data)
+        )
+        prices = np.fromiter(
+            (candle['c'] for candle in ohlcv_data), dtype=np.float64, count=len(ohlcv_data)
+        )
+        
+        # Birdeye returns candles in time order; only sort when it doesn't
+        if len(timestamps) > 1 and (np.diff(timestamps) < 0).any():
+            order = np.argsort(timestamps, kind='stable')
+            timestamps, prices = timestamps[order], prices[order]
+            
+        return timestamps, prices
+        
+    def _simulate_single_trade(
         self,
         signal: Dict,
         token_address: str,
-        price_data: Dict[datetime, float]
+        entry_ts: int,
+        entry_price: float,
+        liquidity: float,
+        position_size: float,
+        price_arrays: Tuple[np.ndarray, np.ndarray]
     ) -> Optional[Dict]:
-        """Simulate a single trade with slippage and fees"""
+        """Simulate a single trade with slippage and fees
         
-        entry_time = signal['timestamp'] + timedelta(seconds=self.config['execution_delay'])
-        
-        # Get entry price with slippage
-        base_price = signal['pool_state'].get('price', 0)
-        if base_price == 0:
-            return None
-            
-        entry_price = base_price * (1 + self.config['entry_slippage'])
-        
-        # Check liquidity constraints
-        liquidity = signal['pool_state'].get('liquidity_usd', 0)
-        if liquidity < self.config['min_liquidity']:
-            return None
-            
-        # Calculate position size (respecting max % of pool)
-        position_size = min(
-            1000,  # Default $1000 position
-            liquidity * self.config['max_position_size']
-        )
+        Entry time (epoch seconds, execution delay included), entry price
+        (slippage included), liquidity and position size come pre-computed
+        from _simulate_trades.
+        """
         
         # Determine exit
-        exit_time, exit_price, exit_reason = await self._determine_exit(
-            entry_time,
+        exit_ts, exit_price, exit_reason = self._determine_exit(
+            entry_ts,
             entry_price,
-            price_data
+            price_arrays
         )
         
         if not exit_price:
@@ -414,16 +556,16 @@ class BacktestEngine:
         
         return {
             'signal_time': signal['timestamp'],
-            'entry_time': entry_time,
+            'entry_time': datetime.fromtimestamp(entry_ts, tz=timezone.utc),
             'entry_price': entry_price,
-            'exit_time': exit_time,
+            'exit_time': datetime.fromtimestamp(exit_ts, tz=timezone.utc),
             'exit_price': exit_price,
             'exit_reason': exit_reason,
             'gross_pnl_percent': gross_pnl_percent,
             'net_pnl_percent': net_pnl_percent,
             'pnl_usd': position_size * net_pnl_percent / 100,
             'position_size': position_size,
-            'hold_duration': exit_time - entry_time,
+            'hold_duration': timedelta(seconds=exit_ts - entry_ts),
             'token_address': token_address,
             'strategy': signal.get('strategy'),
             'signal_metrics': signal.get('metrics', {}),
@@ -431,109 +573,120 @@ class BacktestEngine:
             'entry_market_cap': signal['pool_state'].get('market_cap', 0)
         }
         
-    async def _determine_exit(
+    def _determine_exit(
         self,
-        entry_time: datetime,
+        entry_ts: int,
         entry_price: float,
-        price_data: Dict[datetime, float]
-    ) -> Tuple[datetime, float, str]:
-        """Determine exit time and price based on strategy"""
+        price_arrays: Tuple[np.ndarray, np.ndarray]
+    ) -> Tuple[int, float, str]:
+        """Determine exit time (epoch seconds) and price based on strategy"""
         
         exit_strategy = self.config['exit_strategy']
         
         if exit_strategy == 'time_based':
-            return await self._time_based_exit(entry_time, price_data)
+            return self._time_based_exit(entry_ts, price_arrays)
         elif exit_strategy == 'stop_loss_take_profit':
-            return await self._stop_loss_take_profit_exit(entry_time, entry_price, price_data)
+            return self._stop_loss_take_profit_exit(
+                entry_ts, entry_price, price_arrays
+            )
         elif exit_strategy == 'trailing_stop':
-            return await self._trailing_stop_exit(entry_time, entry_price, price_data)
+            return self._trailing_stop_exit(
+                entry_ts, entry_price, price_arrays
+            )
         else:
             # Default to time-based
-            return await self._time_based_exit(entry_time, price_data)
+            return self._time_based_exit(entry_ts, price_arrays)
             
-    async def _time_based_exit(
+    def _time_based_exit(
         self,
-        entry_time: datetime,
-        price_data: Dict[datetime, float]
-    ) -> Tuple[datetime, float, str]:
+        entry_ts: int,
+        price_arrays: Tuple[np.ndarray, np.ndarray]
+    ) -> Tuple[int, float, str]:
         """Simple time-based exit"""
         
-        exit_time = entry_time + timedelta(seconds=self.config['hold_duration'])
+        exit_ts = entry_ts + int(self.config['hold_duration'])
         
         # Find closest price
-        if not price_data:
-            return exit_time, None, 'no_price_data'
+        timestamps, prices = price_arrays
+        if len(timestamps) == 0:
+            return exit_ts, None, 'no_price_data'
             
-        closest_time = min(
-            price_data.keys(),
-            key=lambda t: abs((t - exit_time).total_seconds())
-        )
+        idx = int(np.searchsorted(timestamps, exit_ts))
         
+        # Neighbours on either side of the insertion point; earlier wins ties
+        if idx == len(timestamps) or (
+            idx > 0 and exit_ts - timestamps[idx - 1] <= timestamps[idx] - exit_ts
+        ):
+            idx -= 1
+            
         # Only use if within 5 minutes
-        if abs((closest_time - exit_time).total_seconds()) <= 300:
-            return exit_time, price_data[closest_time], 'time_based'
+        if abs(int(timestamps[idx]) - exit_ts) <= 300:
+            return exit_ts, float(prices[idx]), 'time_based'
             
-        return exit_time, None, 'no_price_data'
+        return exit_ts, None, 'no_price_data'
+        
+    def _hold_window(
+        self,
+        entry_ts: int,
+        price_arrays: Tuple[np.ndarray, np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Slice the price candles inside the maximum holding window"""
+        
+        timestamps, prices = price_arrays
+        max_hold_ts = entry_ts + self.config['hold_duration'] * 2
         
-    async def _stop_loss_take_profit_exit(
+        start = np.searchsorted(timestamps, entry_ts, side='left')
+        end = np.searchsorted(timestamps, max_hold_ts, side='left')
+        
+        return timestamps[start:end], prices[start:end]
+        
+    def _stop_loss_take_profit_exit(
         self,
-        entry_time: datetime,
+        entry_ts: int,
         entry_price: float,
-        price_data: Dict[datetime, float]
-    ) -> Tuple[datetime, float, str]:
+        price_arrays: Tuple[np.ndarray, np.ndarray]
+    ) -> Tuple[int, float, str]:
         """Exit on stop loss or take profit"""
         
         stop_loss_price = entry_price * (1 - self.config['stop_loss'])
         take_profit_price = entry_price * (1 + self.config['take_profit'])
-        max_hold_time = entry_time + timedelta(seconds=self.config['hold_duration'] * 2)
+        timestamps, prices = self._hold_window(entry_ts, price_arrays)
         
-        # Check each minute
-        current_time = entry_time
-        while current_time < max_hold_time:
-            if current_time in price_data:
-                current_price = price_data[current_time]
-                
-                if current_price <= stop_loss_price:
-                    return current_time, stop_loss_price, 'stop_loss'
-                elif current_price >= take_profit_price:
-                    return current_time, take_profit_price, 'take_profit'
-                    
-            current_time += timedelta(minutes=1)
+        # First candle breaching each level; stop loss wins ties
+        sl_hits = prices <= stop_loss_price
+        tp_hits = prices >= take_profit_price
+        sl_idx = int(np.argmax(sl_hits)) if sl_hits.any() else len(prices)
+        tp_idx = int(np.argmax(tp_hits)) if tp_hits.any() else len(prices)
+        
+        if sl_idx < len(prices) and sl_idx <= tp_idx:
+            return int(timestamps[sl_idx]), stop_loss_price, 'stop_loss'
+        if tp_idx < len(prices):
+            return int(timestamps[tp_idx]), take_profit_price, 'take_profit'
             
         # Time-based exit if no stop/target hit
-        return await self._time_based_exit(entry_time, price_data)
+        return self._time_based_exit(entry_ts, price_arrays)
         
-    async def _trailing_stop_exit(
+    def _trailing_stop_exit(
         self,
-        entry_time: datetime,
+        entry_ts: int,
         entry_price: float,
-        price_data: Dict[datetime, float]
-    ) -> Tuple[datetime, float, str]:
+        price_arrays: Tuple[np.ndarray, np.ndarray]
+    ) -> Tuple[int, float, str]:
         """Exit with trailing stop loss"""
         
         trailing_stop_percent = self.config.get('trailing_stop_percent', 0.05)  # 5%
-        max_hold_time = entry_time + timedelta(seconds=self.config['hold_duration'] * 2)
+        timestamps, prices = self._hold_window(entry_ts, price_arrays)
         
-        highest_price = entry_price
-        current_time = entry_time
+        # Running high since entry, starting from the entry price
+        highest_prices = np.maximum.accumulate(np.maximum(prices, entry_price))
+        hits = prices <= highest_prices * (1 - trailing_stop_percent)
         
-        while current_time < max_hold_time:
-            if current_time in price_data:
-                current_price = price_data[current_time]
-                
-                # Update highest price
-                if current_price > highest_price:
-                    highest_price = current_price
-                    
-                # Check trailing stop
-                stop_price = highest_price * (1 - trailing_stop_percent)
-                if current_price <= stop_price:
-                    return current_time, current_price, 'trailing_stop'
-                    
-            current_time += timedelta(minutes=1)
+        if hits.any():
+            idx = int(np.argmax(hits))
+            return int(timestamps[idx]), float(prices[idx]), 'trailing_stop'
             
         # Time-based exit if stop not hit
-        return await self._time_based_exit(entry_time, price_data)
+        return self._time_based_exit(entry_ts, price_arrays)
         
     def _calculate_portfolio_metrics(
         self,
@@ -552,34 +705,44 @@ class BacktestEngine:
                 'profit_factor': 0
             }
             
-        # Sort trades by entry time
-        trades.sort(key=lambda x: x['entry_time'])
+        # Sort trades by entry time (in place, callers reuse the ordered list)
+        entry_timestamps = np.fromiter(
+            (trade['entry_time'].timestamp() for trade in trades),
+            dtype=np.float64,
+            count=len(trades)
+        )
+        trades[:] = [trades[i] for i in np.argsort(entry_timestamps, kind='stable')]
         
         # Calculate trade metrics
         trade_metrics = calculate_trade_metrics(trades)
         
         # Calculate portfolio equity curve
-        equity = [initial_capital]
-        current_capital = initial_capital
-        
-        for trade in trades:
-            pnl_usd = trade.get('pnl_usd', 0)
-            current_capital += pnl_usd
-            equity.append(current_capital)
-            
-        equity_array = np.array(equity)
+        pnl_usd = np.fromiter(
+            (trade.get('pnl_usd', 0) for trade in trades),
+            dtype=np.float64,
+            count=len(trades)
+        )
+        current_capital, max_equity, min_equity, equity_drawdown = equity_curve_stats(
+            pnl_usd,
+            float(initial_capital)
+        )
         
         # Additional portfolio metrics
         trade_metrics['initial_capital'] = initial_capital
         trade_metrics['final_capital'] = current_capital
         trade_metrics['total_return_usd'] = current_capital - initial_capital
         trade_metrics['total_return_percent'] = ((current_capital - initial_capital) / initial_capital) * 100
-        trade_metrics['max_equity'] = np.max(equity_array)
-        trade_metrics['min_equity'] = np.min(equity_array)
+        trade_metrics['max_equity'] = max_equity
+        trade_metrics['min_equity'] = min_equity
+        trade_metrics['max_equity_drawdown_percent'] = equity_drawdown * 100
         
         # Win/loss streaks
-        trade_metrics['max_win_streak'] = self._calculate_max_streak(trades, True)
-        trade_metrics['max_loss_streak'] = self._calculate_max_streak(trades, False)
+        pnl_percent = np.fromiter(
+            (trade.get('net_pnl_percent', 0) for trade in trades),
+            dtype=np.float64,
+            count=len(trades)
+        )
+        trade_metrics['max_win_streak'], trade_metrics['max_loss_streak'] = self._calculate_max_streaks(pnl_percent)
         
         # Time-based metrics
         if trades:
@@ -588,129 +751,114 @@ class BacktestEngine:
             
         return trade_metrics
         
-    def _calculate_max_streak(self, trades: List[Dict], wins: bool) -> int:
-        """Calculate maximum winning or losing streak"""
+    def _calculate_max_streaks(self, pnl_percent: np.ndarray) -> Tuple[int, int]:
+        """Calculate maximum winning and losing streaks"""
+        
+        max_wins, max_losses = max_streaks(pnl_percent)
+        return int(max_wins), int(max_losses)
         
-        max_streak = 0
-        current_streak = 0
+    def _token_age_requirement(
+        self,
+        strategy: Dict
+    ) -> Optional[Tuple[Callable[[float, float], bool], float, float]]:
+        """Resolve the strategy's token age condition into (operator, unit multiplier, value)"""
         
-        for trade in trades:
-            is_win = trade.get('net_pnl_percent', 0) > 0
+        age_condition = strategy.get('conditions', {}).get('token_age', {})
+        if not age_condition.get('enabled'):
+            return None
             
-            if (wins and is_win) or (not wins and not is_win):
-                current_streak += 1
-                max_streak = max(max_streak, current_streak)
-            else:
-                current_streak = 0
-                
-        return max_streak
+        op = FlexibleSignalDetector.OPERATORS.get(
+            age_condition.get('operator', 'less_than'),
+            operator.lt
+        )
+        unit_multiplier = self.AGE_UNIT_MULTIPLIERS.get(age_condition.get('unit', 'hours'), 1)
         
-    async def _is_token_eligible(
+        return op, unit_multiplier, age_condition.get('value', 0)
+        
+    async def _eligible_tokens(
         self,
-        token_address: str,
+        token_addresses: List[str],
         backtest_start: datetime,
-        strategy: Dict
-    ) -> bool:
-        """Check if token meets strategy eligibility criteria"""
+        age_requirement: Optional[Tuple[Callable[[float, float], bool], float, float]]
+    ) -> set:
+        """Return the tokens meeting strategy eligibility criteria"""
+        
+        # Without an age condition, creation times are only needed to gate
+        # tokens that didn't exist yet, which the config can waive
+        if age_requirement is None and not self.config['require_creation_time']:
+            return set(token_addresses)
+            
+        creation_times = await self.token_tracker.get_token_creation_times(token_addresses)
+        
+        # Tokens with a known creation time, as epoch seconds
+        known = [address for address in token_addresses if creation_times.get(address)]
+        created_ts = np.fromiter(
+            (creation_times[address].timestamp() for address in known),
+            dtype=np.float64,
+            count=len(known)
+        )
+        start_ts = backtest_start.timestamp()
         
-        # Get token creation time
-        creation_time = await self.token_tracker.get_token_creation_time(token_address)
-        if not creation_time:
-            return False
-            
         # Check if token existed before backtest start
-        if creation_time > backtest_start:
-            return False
-            
+        eligible = created_ts <= start_ts
+        
         # Check age requirements from strategy
-        age_condition = strategy.get('conditions', {}).get('token_age', {})
-        if age_condition.get('enabled'):
-            age_at_start = (backtest_start - creation_time).total_seconds() / 3600
-            
-            # Convert to required unit
-            unit = age_condition.get('unit', 'hours')
-            if unit == 'days':
-                age_value = age_at_start / 24
-            elif unit == 'minutes':
-                age_value = age_at_start * 60
-            else:
-                age_value = age_at_start
-                
-            # Check operator
-            from .flexible_detector import FlexibleSignalDetector
-            op = FlexibleSignalDetector.OPERATORS.get(
-                age_condition.get('operator', 'less_than'),
-                operator.lt
-            )
+        if age_requirement:
+            op, unit_multiplier, required_age = age_requirement
+            age_at_start = (start_ts - created_ts) / 3600
+            eligible &= op(age_at_start * unit_multiplier, required_age)
             
-            if not op(age_value, age_condition.get('value', 0)):
-                return False
-                
-        return True
+        return {address for address, ok in zip(known, eligible) if ok}
         
     async def _create_backtest_record(
         self,
+        conn: asyncpg.Connection,
         strategy_id: int,
         start_date: datetime,
         end_date: datetime
     ) -> int:
         """Create backtest record in database"""
         
-        async with self.db.acquire() as conn:
-            backtest_id = await conn.fetchval("""
-                INSERT INTO backtest_results (
-                    strategy_id,
-                    date_range,
-                    status,
-                    created_at
-                )
-                VALUES ($1, $2, 'pending', NOW())
-                RETURNING id
-            """, strategy_id, (start_date, end_date))
-            
+        backtest_id = await conn.fetchval("""
+            INSERT INTO backtest_results (
+                strategy_id,
+                date_range,
+                status,
+                created_at
+            )
+            VALUES ($1, $2, 'pending', NOW())
+            RETURNING id
+        """, strategy_id, (start_date, end_date))
+        
         return backtest_id
         
     async def _update_backtest_status(
         self,
+        conn: asyncpg.Connection,
         backtest_id: int,
         status: str,
         error_message: Optional[str] = None
     ):
         """Update backtest status"""
         
-        async with self.db.acquire() as conn:
-            if status == 'completed':
-                await conn.execute("""
-                    UPDATE backtest_results
-                    SET status = $2, completed_at = NOW()
-                    WHERE id = $1
-                """, backtest_id, status)
-            elif status == 'failed':
-                await conn.execute("""
-                    UPDATE backtest_results
-                    SET status = $2, error_message = $3, completed_at = NOW()
-                    WHERE id = $1
-                """, backtest_id, status, error_message)
-            else:
-                await conn.execute("""
-                    UPDATE backtest_results
-                    SET status = $2
-                    WHERE id = $1
-                """, backtest_id, status)
-                
-    async def _store_transaction(self, parsed_tx: Dict):
-        """Store parsed transaction in database"""
-        
-        async with self.db.acquire() as conn:
-            await conn.execute("""
-                INSERT INTO transactions (
-                    time, signature, token_address, dex, type,
-                    amount_token, amount_usd, wallet_address,
-                    block_slot, success
-                )
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
-                ON CONFLICT (signature) DO NOTHING
-            """,
+        # A single statement text, so asyncpg's per-connection statement cache
+        # prepares it once instead of parsing one of three variants per call
+        await conn.execute("""
+            UPDATE backtest_results
+            SET status = $2,
+                error_message = CASE WHEN $2 = 'failed' THEN $3 ELSE error_message END,
+                completed_at = CASE
+                    WHEN $2 IN ('completed', 'failed') THEN NOW()
+                    ELSE completed_at
+                END
+            WHERE id = $1
+        """, backtest_id, status, error_message)
+        
+    async def _store_transactions(self, parsed_txs: List[Dict]):
+        """Store parsed transactions in database with one batched statement"""
+        
+        rows = [
+            (
                 parsed_tx['timestamp'],
                 parsed_tx['signature'],
                 parsed_tx['token_address'],
@@ -722,9 +870,23 @@ class BacktestEngine:
                 parsed_tx.get('slot'),
                 parsed_tx.get('success', True)
             )
+            for parsed_tx in parsed_txs
+        ]
+        
+        async with self.db.acquire() as conn:
+            await conn.executemany("""
+                INSERT INTO transactions (
+                    time, signature, token_address, dex, type,
+                    amount_token, amount_usd, wallet_address,
+                    block_slot, success
+                )
+                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
+                ON CONFLICT (signature) DO NOTHING
+            """, rows)
             
     async def _store_backtest_results(
         self,
+        conn: asyncpg.Connection,
         backtest_id: int,
         signals: List[Dict],
         trades: List[Dict],
@@ -732,39 +894,31 @@ class BacktestEngine:
     ):
         """Store backtest results in database"""
         
-        async with self.db.acquire() as conn:
-            # Update backtest summary
-            await conn.execute("""
-                UPDATE backtest_results
-                SET 
-                    total_signals = $2,
-                    trades_executed = $3,
-                    win_rate = $4,
-                    total_pnl = $5,
-                    sharpe_ratio = $6,
-                    max_drawdown = $7
-                WHERE id = $1
-            """,
-                backtest_id,
-                len(signals),
-                len(trades),
-                metrics.get('win_rate', 0),
-                metrics.get('total_return_percent', 0),
-                metrics.get('sharpe_ratio', 0),
-                metrics.get('max_drawdown', 0)
-            )
-            
-            # Store individual trades
-            for trade in trades:
-                await conn.execute("""
-                    INSERT INTO backtest_trades (
-                        backtest_id, token_address, signal_time,
-                        entry_time, entry_price, exit_time, exit_price,
-                        pnl_percent, pnl_usd, hold_duration,
-                        exit_reason, signal_metrics
-                    )
-                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12)
-                """,
+        # Update backtest summary
+        await conn.execute("""
+            UPDATE backtest_results
+            SET 
+                total_signals = $2,
+                trades_executed = $3,
+                win_rate = $4,
+                total_pnl = $5,
+                sharpe_ratio = $6,
+                max_drawdown = $7
+            WHERE id = $1
+        """,
+            backtest_id,
+            len(signals),
+            len(trades),
+            metrics.get('win_rate', 0),
+            metrics.get('total_return_percent', 0),
+            metrics.get('sharpe_ratio', 0),
+            metrics.get('max_drawdown', 0)
+        )
+        
+        # Store individual trades in a single COPY
+        if trades:
+            records = [
+                (
                     backtest_id,
                     trade['token_address'],
                     trade['signal_time'],
@@ -776,9 +930,22 @@ class BacktestEngine:
                     trade['pnl_usd'],
                     trade['hold_duration'],
                     trade['exit_reason'],
-                    json.dumps(trade.get('signal_metrics', {}))
+                    trade.get('signal_metrics', {})
                 )
-                
+                for trade in trades
+            ]
+            
+            await conn.copy_records_to_table(
+                'backtest_trades',
+                records=records,
+                columns=[
+                    'backtest_id', 'token_address', 'signal_time',
+                    'entry_time', 'entry_price', 'exit_time', 'exit_price',
+                    'pnl_percent', 'pnl_usd', 'hold_duration',
+                    'exit_reason', 'signal_metrics'
+                ]
+            )
+        
     def _generate_summary(self, trades: List[Dict], metrics: Dict) -> str:
         """Generate human-readable summary"""
         
@@ -1,9 +1,16 @@
-from typing import Dict, List, Optional
-from datetime import datetime, timedelta
-from collections import deque
+from typing import Dict, List, Tuple
+from datetime import datetime
 import numpy as np
 import logging
 
+from ._kernels import (
+    WINDOW_METRICS,
+    parse_timestamps,
+    scan_signals,
+    sort_by_time,
+    transaction_arrays
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,118 +41,124 @@ class SignalDetector:
     ) -> List[Dict]:
         """Detect signals based on fixed criteria"""
         
-        signals = []
-        
-        # Sort transactions by time
-        sorted_txs = sorted(transactions, key=lambda x: x.get('timestamp', x.get('time')))
-        
-        # Use sliding window
-        window = deque()
+        if not transactions:
+            return []
+            
+        # Sort transactions by time and unpack them into flat arrays
+        sorted_txs, soa = self._to_soa(transactions)
+        pool_keys, pool_ts, pool_liq, pool_mc = self._pool_arrays(pool_states)
+        
+        results = scan_signals(
+            soa['timestamps'],
+            soa['amount_usd'],
+            soa['is_buy'],
+            soa['is_sell'],
+            *self._kernel_thresholds(),
+            pool_ts,
+            pool_liq,
+            pool_mc
+        )
+        
+        return self._build_signals(sorted_txs, pool_states, pool_keys, token_address, *results)
+        
+    def _kernel_thresholds(self) -> Tuple[int, float, int, float, float, float]:
+        """Window length and thresholds in the types the scan kernel expects"""
+        
+        return (
+            int(self.window_seconds * 1_000_000_000),
+            float(self.large_buy_threshold),
+            int(self.min_large_buys),
+            float(self.min_volume),
+            float(self.min_liquidity),
+            float(self.max_market_cap)
+        )
+        
+    def _build_signals(
+        self,
+        sorted_txs: List[Dict],
+        pool_states: Dict[datetime, Dict],
+        pool_keys: List[datetime],
+        token_address: str,
+        signal_indices: np.ndarray,
+        pool_indices: np.ndarray,
+        window_sizes: np.ndarray,
+        window_totals: np.ndarray
+    ) -> List[Dict]:
+        """Turn scan kernel results for one token into signal dicts"""
         
-        for tx in sorted_txs:
-            tx_time = tx.get('timestamp', tx.get('time'))
-            if isinstance(tx_time, str):
-                tx_time = datetime.fromisoformat(tx_time)
-                
-            # Add to window
-            window.append(tx)
+        signals = []
+        for i, p, size, totals in zip(
+            signal_indices.tolist(),
+            pool_indices.tolist(),
+            window_sizes.tolist(),
+            window_totals.tolist()
+        ):
+            signals.append({
+                'timestamp': self._tx_time(sorted_txs[i]),
+                'token_address': token_address,
+                'pool_state': pool_states[pool_keys[p]],
+                'window_transactions': size,
+                'metrics': self._calculate_window_metrics(totals)
+            })
             
-            # Remove old transactions
-            cutoff = tx_time - timedelta(seconds=self.window_seconds)
-            while window and window[0].get('timestamp', window[0].get('time')) < cutoff:
-                window.popleft()
-                
-            # Get current pool state
-            pool_state = self._get_pool_state_at_time(tx_time, pool_states)
-            if not pool_state:
-                continue
-                
-            # Check signal conditions
-            if self._check_signal_conditions(list(window), pool_state):
-                signal = {
-                    'timestamp': tx_time,
-                    'token_address': token_address,
-                    'pool_state': pool_state,
-                    'window_transactions': len(window),
-                    'metrics': self._calculate_window_metrics(list(window))
-                }
-                signals.append(signal)
-                
-                # Clear window to avoid duplicate signals
-                window.clear()
-                
         return signals
         
-    def _get_pool_state_at_time(
-        self,
-        timestamp: datetime,
-        pool_states: Dict[datetime, Dict]
-    ) -> Optional[Dict]:
-        """Get pool state at or near timestamp"""
+    @staticmethod
+    def _tx_time(tx: Dict) -> datetime:
+        """Get a transaction's timestamp as a datetime"""
         
-        if not pool_states:
-            return None
-            
-        # Find closest timestamp
-        closest = min(pool_states.keys(), key=lambda t: abs((t - timestamp).total_seconds()))
+        tx_time = tx.get('timestamp', tx.get('time'))
+        if isinstance(tx_time, str):
+            tx_time = datetime.fromisoformat(tx_time)
+        return tx_time
         
-        # Only use if within 5 minutes
-        if abs((closest - timestamp).total_seconds()) <= 300:
-            return pool_states[closest]
-            
-        return None
+    def _to_soa(self, transactions: List[Dict]) -> Tuple[List[Dict], Dict[str, np.ndarray]]:
+        """Sort transactions by time and extract their fields into parallel arrays"""
         
-    def _check_signal_conditions(
-        self,
-        window_txs: List[Dict],
-        pool_state: Dict
-    ) -> bool:
-        """Check if window meets signal conditions"""
-        
-        # Check liquidity
-        if pool_state.get('liquidity_usd', 0) < self.min_liquidity:
-            return False
-            
-        # Check market cap
-        if pool_state.get('market_cap', float('inf')) > self.max_market_cap:
-            return False
-            
-        # Calculate window metrics
-        metrics = self._calculate_window_metrics(window_txs)
+        timestamps, sorted_txs = sort_by_time(
+            parse_timestamps([tx.get('timestamp', tx.get('time')) for tx in transactions]),
+            transactions
+        )
         
-        # Check volume
-        if metrics['total_volume'] < self.min_volume:
-            return False
-            
-        # Check large buys
-        if metrics['large_buy_count'] < self.min_large_buys:
-            return False
+        soa = transaction_arrays(sorted_txs)
+        soa['timestamps'] = timestamps
+        return sorted_txs, soa
+        
+    def _pool_arrays(
+        self,
+        pool_states: Dict[datetime, Dict]
+    ) -> Tuple[List[datetime], np.ndarray, np.ndarray, np.ndarray]:
+        """Sort pool states by time into timestamp, liquidity and market cap arrays"""
+        
+        keys = list(pool_states)
+        pool_ts, pool_keys = sort_by_time(parse_timestamps(keys), keys)
+        states = [pool_states[k] for k in pool_keys]
+        count = len(states)
+        
+        # Empty states can never pass the liquidity check
+        pool_liq = np.fromiter(
+            (state.get('liquidity_usd', 0) if state else -np.inf for state in states),
+            dtype=np.float64,
+            count=count
+        )
+        pool_mc = np.fromiter(
+            (state.get('market_cap', np.inf) if state else np.inf for state in states),
+            dtype=np.float64,
+            count=count
+        )
+        return pool_keys, pool_ts, pool_liq, pool_mc
+        
+    def _calculate_window_metrics(self, totals: List[float]) -> Dict:
+        """Build the metrics dict from a window's running totals"""
+        
+        metrics = dict(zip(WINDOW_METRICS, totals))
+        for key in ('buy_count', 'sell_count', 'large_buy_count'):
+            metrics[key] = int(metrics[key])
             
-        return True
-        
-    def _calculate_window_metrics(self, window_txs: List[Dict]) -> Dict:
-        """Calculate metrics for transaction window"""
-        
-        buy_txs = [tx for tx in window_txs if tx.get('type') == 'buy']
-        sell_txs = [tx for tx in window_txs if tx.get('type') == 'sell']
-        
-        large_buys = [
-            tx for tx in buy_txs
-            if tx.get('amount_usd', 0) >= self.large_buy_threshold
-        ]
-        
-        total_volume = sum(tx.get('amount_usd', 0) for tx in window_txs)
-        buy_volume = sum(tx.get('amount_usd', 0) for tx in buy_txs)
-        sell_volume = sum(tx.get('amount_usd', 0) for tx in sell_txs)
-        
-        return {
-            'total_volume': total_volume,
-            'buy_volume': buy_volume,
-            'sell_volume': sell_volume,
-            'buy_count': len(buy_txs),
-            'sell_count': len(sell_txs),
-            'large_buy_count': len(large_buys),
-            'large_buy_volume': sum(tx.get('amount_usd', 0) for tx in large_buys),
-            'buy_sell_ratio': len(buy_txs) / len(sell_txs) if sell_txs else float('inf'),
-            'volume_ratio': buy_volume / sell_volume if sell_volume > 0 else float('inf')
-        }
\ No newline at end of file
+        buy_volume = metrics['buy_volume']
+        sell_volume = metrics['sell_volume']
+        metrics['buy_sell_ratio'] = (
+            metrics['buy_count'] / metrics['sell_count'] if metrics['sell_count'] else float('inf')
+        )
+        metrics['volume_ratio'] = buy_volume / sell_volume if sell_volume > 0 else float('inf')
+        return metrics
@@ -1,15 +1,94 @@
-from typing import Dict, List, Any, Optional, Callable
-from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Any, Optional, Callable, Tuple
+from datetime import datetime
 import operator
-from collections import deque
+from collections import Counter, deque
 import numpy as np
 import logging
 
 from src.services import TokenAgeTracker
+from ._kernels import (
+    POOL_STATE_TOLERANCE_NS,
+    closest_indices,
+    from_epoch_ns,
+    parse_timestamps,
+    sort_by_time,
+    transaction_arrays
+)
 
 logger = logging.getLogger(__name__)
 
 
+class _RollingWindow:
+    """Distinct wallets and largest trades over a window of sorted transactions that only moves forward"""
+    
+    def __init__(self, transactions: List[Dict], soa: Dict[str, np.ndarray]):
+        self.wallets = [tx.get('wallet_address') for tx in transactions]
+        self.amounts = soa['amount_usd'].tolist()
+        self.is_buy = soa['is_buy'].tolist()
+        self.is_sell = soa['is_sell'].tolist()
+        self.lo = self.hi = 0
+        
+        # Any transaction, buys, sells, and buys or sells
+        self.all = Counter()
+        self.buyers = Counter()
+        self.sellers = Counter()
+        self.traders = Counter()
+        
+        # Indices of buys and sells with decreasing amounts; the head is the window max
+        self.buy_max = deque()
+        self.sell_max = deque()
+        
+    @property
+    def largest_buy(self) -> float:
+        return self.amounts[self.buy_max[0]] if self.buy_max else 0
+        
+    @property
+    def largest_sell(self) -> float:
+        return self.amounts[self.sell_max[0]] if self.sell_max else 0
+        
+    def advance(self, lo: int, hi: int):
+        """Move the window to the transactions in [lo, hi)"""
+        
+        while self.hi < hi:
+            self._update(self.hi, 1)
+            self.hi += 1
+        while self.lo < lo:
+            self._update(self.lo, -1)
+            self.lo += 1
+            
+    def _update(self, i: int, delta: int):
+        """Add or remove one transaction"""
+        
+        counters = [self.all]
+        if self.is_buy[i]:
+            counters += (self.buyers, self.traders)
+            self._track_max(self.buy_max, i, delta)
+        elif self.is_sell[i]:
+            counters += (self.sellers, self.traders)
+            self._track_max(self.sell_max, i, delta)
+            
+        wallet = self.wallets[i]
+        if not wallet:
+            return
+            
+        for counter in counters:
+            counter[wallet] += delta
+            if not counter[wallet]:
+                del counter[wallet]
+                
+    def _track_max(self, candidates: deque, i: int, delta: int):
+        """Keep a monotonic deque of window maximum candidates"""
+        
+        if delta > 0:
+            # Earlier trades no larger than this one can never be the max again
+            amount = self.amounts[i]
+            while candidates and self.amounts[candidates[-1]] <= amount:
+                candidates.pop()
+            candidates.append(i)
+        elif candidates and candidates[0] == i:
+            candidates.popleft()
+
+
 class FlexibleSignalDetector:
     """Signal detector with configurable conditions"""
     
@@ -23,6 +102,19 @@ class FlexibleSignalDetector:
         'not_equal': operator.ne
     }
     
+    # Conditions listed in a signal's conditions_met, where disabled ones count as met
+    REPORTED_CONDITIONS = (
+        'liquidity',
+        'volume_window',
+        'market_cap',
+        'large_buys',
+        'buy_pressure',
+        'unique_wallets'
+    )
+    
+    # Distinct timestamps after a signal that cannot fire another one
+    SIGNAL_COOLDOWN_TIMESTAMPS = 5
+    
     def __init__(self, strategy_config: Dict, token_tracker: TokenAgeTracker):
         self.conditions = strategy_config.get('conditions', {})
         self.token_tracker = token_tracker
@@ -32,6 +124,9 @@ class FlexibleSignalDetector:
         # Validate conditions on initialization
         self._validate_conditions()
         
+        # Bind enabled conditions to their operator and threshold once
+        self._predicates = self._compile_conditions()
+        
     def _validate_conditions(self):
         """Validate strategy conditions"""
         
@@ -55,55 +150,90 @@ class FlexibleSignalDetector:
     ) -> List[Dict]:
         """Detect signals based on flexible conditions"""
         
-        signals = []
-        
         # Check token age first (if enabled)
         if not await self._check_token_age(token_address):
             logger.debug(f"Token {token_address} doesn't meet age criteria")
             return []
             
-        # Group transactions by time for rolling window
-        tx_by_time = self._group_by_time(transactions)
+        # Token age is the only awaitable check, the window scan runs without yielding
+        return self._scan_windows(transactions, pool_states, token_address)
+        
+    def _scan_windows(
+        self,
+        transactions: List[Dict],
+        pool_states: Dict[datetime, Dict],
+        token_address: str
+    ) -> List[Dict]:
+        """Slide the rolling window over the transactions and collect signals"""
+        
+        signals = []
+        
+        # Sort transactions once and find where each distinct timestamp starts
+        sorted_txs, sorted_ns, group_starts = self._group_by_time(transactions)
+        group_ends = np.append(group_starts[1:], len(sorted_txs))
+        group_ns = sorted_ns[group_starts]
         
         # Get window size from conditions
         window_seconds = self._get_window_seconds()
         
-        # Use deque for efficient rolling window
-        window = deque()
-        
-        for timestamp in sorted(tx_by_time.keys()):
-            # Add new transactions to window
-            window.extend(tx_by_time[timestamp])
-            
-            # Remove old transactions
-            cutoff_time = timestamp - timedelta(seconds=window_seconds)
-            while window and window[0]['timestamp'] < cutoff_time:
-                window.popleft()
+        # Left edge of the rolling window ending at each timestamp
+        window_starts = np.searchsorted(
+            sorted_ns,
+            group_ns - window_seconds * 1_000_000_000,
+            side='left'
+        )
+        
+        # Closest pool state for every timestamp in one batch of binary searches
+        pool_ts, pool_values = self._index_pool_states(pool_states)
+        pool_indices = closest_indices(pool_ts, group_ns, POOL_STATE_TOLERANCE_NS)
+        
+        # Unpack the fields the checks read once, then keep running totals
+        # so each window's counters are a subtraction away
+        soa = transaction_arrays(sorted_txs)
+        prefix = self._window_prefix_sums(soa)
+        count_wallets = self.conditions.get('unique_wallets', {}).get('enabled', False)
+        window = _RollingWindow(sorted_txs, soa)
+        
+        skip_until = 0
+        for group, (timestamp_ns, p, lo, hi) in enumerate(zip(
+            group_ns.tolist(),
+            pool_indices.tolist(),
+            window_starts.tolist(),
+            group_ends.tolist()
+        )):
+            # Skipped timestamps still enter the window, they just can't signal
+            if group < skip_until:
+                continue
                 
-            # Get pool state
-            pool_state = self._get_closest_pool_state(timestamp, pool_states)
+            # Only use a pool state within 5 minutes
+            pool_state = pool_values[p] if p >= 0 else None
             if not pool_state:
                 continue
                 
+            window_txs = sorted_txs[lo:hi]
+            window_metrics = self._window_totals(prefix, lo, hi)
+            if count_wallets:
+                window.advance(lo, hi)
+                window_metrics['unique_wallets'] = len(window.all)
+                
             # Check all conditions
-            if await self._check_all_conditions(list(window), pool_state, token_address):
+            if self._check_all_conditions(window_metrics, pool_state):
+                window.advance(lo, hi)
                 signal = {
-                    'timestamp': timestamp,
+                    'timestamp': from_epoch_ns(timestamp_ns),
                     'token_address': token_address,
-                    'transactions': list(window),
+                    'transactions': window_txs,
                     'pool_state': pool_state,
-                    'metrics': self._calculate_metrics(list(window), pool_state),
+                    'metrics': self._calculate_metrics(window_txs, pool_state, window_metrics, window),
                     'strategy': self.strategy_name,
                     'strategy_id': self.strategy_id,
-                    'conditions_met': self._get_met_conditions(list(window), pool_state)
+                    # Every enabled condition just passed, so all of them were met
+                    'conditions_met': list(self.REPORTED_CONDITIONS)
                 }
                 signals.append(signal)
                 
                 # Avoid duplicate signals in close succession
-                # Skip next few seconds to prevent multiple signals
-                for _ in range(5):
-                    if tx_by_time:
-                        tx_by_time.pop(min(tx_by_time.keys()), None)
+                skip_until = group + 1 + self.SIGNAL_COOLDOWN_TIMESTAMPS
                 
         return signals
         
@@ -122,39 +252,35 @@ class FlexibleSignalDetector:
         # Default
         return 30
         
-    def _group_by_time(self, transactions: List[Dict]) -> Dict[datetime, List[Dict]]:
-        """Group transactions by timestamp"""
-        grouped = {}
-        for tx in transactions:
-            timestamp = tx.get('timestamp') or tx.get('time')
-            if isinstance(timestamp, str):
-                timestamp = datetime.fromisoformat(timestamp)
-            if timestamp.tzinfo is None:
-                timestamp = timestamp.replace(tzinfo=timezone.utc)
-                
-            if timestamp not in grouped:
-                grouped[timestamp] = []
-            grouped[timestamp].append(tx)
-        return grouped
+    def _group_by_time(
+        self,
+        transactions: List[Dict]
+    ) -> Tuple[List[Dict], np.ndarray, np.ndarray]:
+        """
+        Sort transactions by timestamp and group equal timestamps
+        
+        Returns:
+            (sorted_txs, timestamps_ns, group_starts), where group_starts
+            indexes the first transaction of each distinct timestamp
+        """
         
-    def _get_closest_pool_state(
+        timestamps_ns, sorted_txs = sort_by_time(
+            parse_timestamps([tx.get('timestamp') or tx.get('time') for tx in transactions]),
+            transactions
+        )
+        
+        # A group starts wherever the timestamp changes
+        group_starts = np.flatnonzero(np.diff(timestamps_ns, prepend=timestamps_ns[:1] - 1))
+        
+        return sorted_txs, timestamps_ns, group_starts
+        
+    def _index_pool_states(
         self,
-        timestamp: datetime,
         pool_states: Dict[datetime, Dict]
-    ) -> Optional[Dict]:
-        """Get pool state closest to timestamp"""
-        
-        if not pool_states:
-            return None
-            
-        # Find closest timestamp
-        closest_time = min(pool_states.keys(), key=lambda t: abs((t - timestamp).total_seconds()))
+    ) -> Tuple[np.ndarray, List[Dict]]:
+        """Sort pool states into an epoch-nanosecond array and matching values"""
         
-        # Only use if within 5 minutes
-        if abs((closest_time - timestamp).total_seconds()) <= 300:
-            return pool_states[closest_time]
-            
-        return None
+        return sort_by_time(parse_timestamps(list(pool_states)), list(pool_states.values()))
         
     async def _check_token_age(self, token_address: str) -> bool:
         """Check if token meets age criteria"""
@@ -188,172 +314,162 @@ class FlexibleSignalDetector:
             
         return result
         
-    async def _check_all_conditions(
-        self,
-        window_txs: List[Dict],
-        pool_state: Dict,
-        token_address: str
-    ) -> bool:
-        """Check all enabled conditions"""
-        
-        # Check each condition type
-        checks = [
-            self._check_liquidity(pool_state),
-            self._check_volume(window_txs),
-            self._check_market_cap(pool_state),
-            self._check_large_buys(window_txs),
-            self._check_buy_pressure(window_txs),
-            self._check_unique_wallets(window_txs),
-            self._check_price_change(pool_state)
-        ]
+    def _window_prefix_sums(self, soa: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Cumulative window counters over sorted transactions, each led by a zero"""
         
-        # All enabled conditions must pass
-        return all(checks)
-        
-    def _check_liquidity(self, pool_state: Dict) -> bool:
-        """Check liquidity condition"""
-        
-        liq_config = self.conditions.get('liquidity', {})
-        if not liq_config.get('enabled', False):
-            return True
-            
-        liquidity = pool_state.get('liquidity_usd', 0)
-        op = self.OPERATORS.get(liq_config['operator'], operator.gt)
+        amounts = soa['amount_usd']
+        is_buy = soa['is_buy']
         
-        return op(liquidity, liq_config['value'])
+        min_amount = self.conditions.get('large_buys', {}).get('min_amount', 1000)
+        columns = {
+            'total_volume': amounts,
+            'buy_volume': amounts * is_buy,
+            'sell_volume': amounts * soa['is_sell'],
+            'buy_count': is_buy,
+            'sell_count': soa['is_sell'],
+            'large_buy_count': is_buy & (amounts >= min_amount)
+        }
+        return {name: np.concatenate(([0], np.cumsum(column))) for name, column in columns.items()}
         
-    def _check_volume(self, window_txs: List[Dict]) -> bool:
-        """Check volume in window"""
+    def _window_totals(self, prefix: Dict[str, np.ndarray], lo: int, hi: int) -> Dict[str, Any]:
+        """Counters for the transactions in [lo, hi)"""
         
-        vol_config = self.conditions.get('volume_window', {})
-        if not vol_config.get('enabled', False):
-            return True
-            
-        total_volume = sum(tx.get('amount_usd', 0) for tx in window_txs)
-        op = self.OPERATORS.get(vol_config['operator'], operator.gte)
+        return {name: (cumulative[hi] - cumulative[lo]).item() for name, cumulative in prefix.items()}
         
-        return op(total_volume, vol_config['value'])
+    def _compile_conditions(self) -> Dict[str, Callable[[Dict, Dict], bool]]:
+        """Build a (metrics, pool_state) predicate for each enabled condition, in check order"""
         
-    def _check_market_cap(self, pool_state: Dict) -> bool:
-        """Check market cap condition"""
+        predicates = {}
         
-        mc_config = self.conditions.get('market_cap', {})
-        if not mc_config.get('enabled', False):
-            return True
+        def configured(name: str, default_op: Callable):
+            config = self.conditions.get(name, {})
+            if not config.get('enabled', False):
+                return None
+            return config, self.OPERATORS.get(config.get('operator'), default_op)
+            
+        found = configured('liquidity', operator.gt)
+        if found:
+            config, op = found
+            predicates['liquidity'] = lambda m, p, op=op, v=config['value']: op(p.get('liquidity_usd', 0), v)
+            
+        found = configured('volume_window', operator.ge)
+        if found:
+            config, op = found
+            predicates['volume_window'] = lambda m, p, op=op, v=config['value']: op(m['total_volume'], v)
+            
+        found = configured('market_cap', operator.lt)
+        if found:
+            config, op = found
+            predicates['market_cap'] = lambda m, p, op=op, v=config['value']: op(p.get('market_cap', float('inf')), v)
+            
+        found = configured('large_buys', operator.ge)
+        if found:
+            config, _ = found
+            predicates['large_buys'] = lambda m, p, n=config.get('min_count', 5): m['large_buy_count'] >= n
+            
+        found = configured('buy_pressure', operator.gt)
+        if found:
+            config, op = found
+            
+            def buy_pressure(m, p, op=op, v=config['value']):
+                buys, sells = m['buy_count'], m['sell_count']
+                if not sells:
+                    return op(float('inf') if buys else 0, v)
+                return op(buys / sells, v)
+                
+            predicates['buy_pressure'] = buy_pressure
+            
+        found = configured('unique_wallets', operator.ge)
+        if found:
+            config, op = found
+            predicates['unique_wallets'] = lambda m, p, op=op, v=config['value']: op(m['unique_wallets'], v)
+            
+        # This would need historical price data
+        # For now, treat a missing price change as zero
+        found = configured('price_change', operator.gt)
+        if found:
+            config, op = found
+            predicates['price_change'] = lambda m, p, op=op, v=config['value']: op(p.get('price_change_percent', 0), v)
             
-        market_cap = pool_state.get('market_cap', float('inf'))
-        op = self.OPERATORS.get(mc_config['operator'], operator.lt)
+        return predicates
         
-        return op(market_cap, mc_config['value'])
+    def _check_condition(self, name: str, metrics: Optional[Dict], pool_state: Optional[Dict]) -> bool:
+        """Check a single condition, treating disabled ones as met"""
         
-    def _check_large_buys(self, window_txs: List[Dict]) -> bool:
-        """Check large buy conditions"""
+        predicate = self._predicates.get(name)
+        return predicate is None or predicate(metrics, pool_state)
         
-        lb_config = self.conditions.get('large_buys', {})
-        if not lb_config.get('enabled', False):
-            return True
-            
-        large_buys = [
-            tx for tx in window_txs
-            if tx.get('type') == 'buy' and 
-            tx.get('amount_usd', 0) >= lb_config.get('min_amount', 1000)
-        ]
+    def _check_all_conditions(self, metrics: Dict, pool_state: Dict) -> bool:
+        """Check all enabled conditions, stopping at the first failure"""
         
-        return len(large_buys) >= lb_config.get('min_count', 5)
+        # All enabled conditions must pass
+        return all(predicate(metrics, pool_state) for predicate in self._predicates.values())
         
-    def _check_buy_pressure(self, window_txs: List[Dict]) -> bool:
-        """Check buy/sell pressure ratio"""
+    def _check_liquidity(self, pool_state: Dict) -> bool:
+        """Check liquidity condition"""
+        return self._check_condition('liquidity', None, pool_state)
         
-        bp_config = self.conditions.get('buy_pressure', {})
-        if not bp_config.get('enabled', False):
-            return True
-            
-        buys = [tx for tx in window_txs if tx.get('type') == 'buy']
-        sells = [tx for tx in window_txs if tx.get('type') == 'sell']
+    def _check_volume(self, metrics: Dict) -> bool:
+        """Check volume in window"""
+        return self._check_condition('volume_window', metrics, None)
         
-        if not sells:
-            ratio = float('inf') if buys else 0
-        else:
-            ratio = len(buys) / len(sells)
-            
-        op = self.OPERATORS.get(bp_config['operator'], operator.gt)
-        return op(ratio, bp_config['value'])
+    def _check_market_cap(self, pool_state: Dict) -> bool:
+        """Check market cap condition"""
+        return self._check_condition('market_cap', None, pool_state)
         
-    def _check_unique_wallets(self, window_txs: List[Dict]) -> bool:
-        """Check unique wallet count"""
+    def _check_large_buys(self, metrics: Dict) -> bool:
+        """Check large buy conditions"""
+        return self._check_condition('large_buys', metrics, None)
         
-        uw_config = self.conditions.get('unique_wallets', {})
-        if not uw_config.get('enabled', False):
-            return True
-            
-        unique_wallets = set(tx.get('wallet_address') for tx in window_txs if tx.get('wallet_address'))
-        op = self.OPERATORS.get(uw_config['operator'], operator.gte)
+    def _check_buy_pressure(self, metrics: Dict) -> bool:
+        """Check buy/sell pressure ratio"""
+        return self._check_condition('buy_pressure', metrics, None)
         
-        return op(len(unique_wallets), uw_config['value'])
+    def _check_unique_wallets(self, metrics: Dict) -> bool:
+        """Check unique wallet count"""
+        return self._check_condition('unique_wallets', metrics, None)
         
     def _check_price_change(self, pool_state: Dict) -> bool:
         """Check price change condition"""
+        return self._check_condition('price_change', None, pool_state)
         
-        pc_config = self.conditions.get('price_change', {})
-        if not pc_config.get('enabled', False):
-            return True
+    def _calculate_metrics(
+        self,
+        window_txs: List[Dict],
+        pool_state: Dict,
+        totals: Optional[Dict[str, Any]] = None,
+        window: Optional[_RollingWindow] = None
+    ) -> Dict:
+        """Calculate metrics for signal, reusing the scan's window totals and rolling state if given"""
+        
+        if totals is None:
+            soa = transaction_arrays(window_txs)
+            totals = self._window_totals(self._window_prefix_sums(soa), 0, len(window_txs))
+            window = _RollingWindow(window_txs, soa)
+            window.advance(0, len(window_txs))
             
-        # This would need historical price data
-        # For now, return True if not available
-        price_change = pool_state.get('price_change_percent', 0)
-        op = self.OPERATORS.get(pc_config['operator'], operator.gt)
-        
-        return op(price_change, pc_config['value'])
-        
-    def _calculate_metrics(self, window_txs: List[Dict], pool_state: Dict) -> Dict:
-        """Calculate metrics for signal"""
-        
-        buy_txs = [tx for tx in window_txs if tx.get('type') == 'buy']
-        sell_txs = [tx for tx in window_txs if tx.get('type') == 'sell']
-        
-        buy_volumes = [tx.get('amount_usd', 0) for tx in buy_txs]
-        sell_volumes = [tx.get('amount_usd', 0) for tx in sell_txs]
-        
-        unique_buyers = set(tx.get('wallet_address') for tx in buy_txs if tx.get('wallet_address'))
-        unique_sellers = set(tx.get('wallet_address') for tx in sell_txs if tx.get('wallet_address'))
+        buy_count = totals['buy_count']
+        sell_count = totals['sell_count']
+        buy_volume = totals['buy_volume']
+        sell_volume = totals['sell_volume']
         
         return {
             'total_transactions': len(window_txs),
-            'buy_transactions': len(buy_txs),
-            'sell_transactions': len(sell_txs),
-            'total_volume': sum(buy_volumes) + sum(sell_volumes),
-            'buy_volume': sum(buy_volumes),
-            'sell_volume': sum(sell_volumes),
-            'buy_sell_ratio': len(buy_txs) / len(sell_txs) if sell_txs else float('inf'),
-            'volume_ratio': sum(buy_volumes) / sum(sell_volumes) if sell_volumes else float('inf'),
-            'average_buy_size': np.mean(buy_volumes) if buy_volumes else 0,
-            'average_sell_size': np.mean(sell_volumes) if sell_volumes else 0,
-            'largest_buy': max(buy_volumes) if buy_volumes else 0,
-            'largest_sell': max(sell_volumes) if sell_volumes else 0,
-            'unique_buyers': len(unique_buyers),
-            'unique_sellers': len(unique_sellers),
-            'unique_wallets': len(unique_buyers.union(unique_sellers)),
+            'buy_transactions': buy_count,
+            'sell_transactions': sell_count,
+            'total_volume': buy_volume + sell_volume,
+            'buy_volume': buy_volume,
+            'sell_volume': sell_volume,
+            'buy_sell_ratio': buy_count / sell_count if sell_count else float('inf'),
+            'volume_ratio': buy_volume / sell_volume if sell_count else float('inf'),
+            'average_buy_size': buy_volume / buy_count if buy_count else 0,
+            'average_sell_size': sell_volume / sell_count if sell_count else 0,
+            'largest_buy': window.largest_buy,
+            'largest_sell': window.largest_sell,
+            'unique_buyers': len(window.buyers),
+            'unique_sellers': len(window.sellers),
+            'unique_wallets': len(window.traders),
             'liquidity': pool_state.get('liquidity_usd', 0),
             'market_cap': pool_state.get('market_cap', 0),
             'price': pool_state.get('price', 0)
-        }
-        
-    def _get_met_conditions(self, window_txs: List[Dict], pool_state: Dict) -> List[str]:
-        """Get list of conditions that were met"""
-        
-        met_conditions = []
-        
-        if self._check_liquidity(pool_state):
-            met_conditions.append('liquidity')
-        if self._check_volume(window_txs):
-            met_conditions.append('volume_window')
-        if self._check_market_cap(pool_state):
-            met_conditions.append('market_cap')
-        if self._check_large_buys(window_txs):
-            met_conditions.append('large_buys')
-        if self._check_buy_pressure(window_txs):
-            met_conditions.append('buy_pressure')
-        if self._check_unique_wallets(window_txs):
-            met_conditions.append('unique_wallets')
-            
-        return met_conditions
\ No newline at end of file
+        }
\ No newline at end of file
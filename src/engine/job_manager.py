@@ -1,17 +1,81 @@
 """Async job management for backtests"""
 
 import asyncio
-import json
 import logging
+import time
 import uuid
 from datetime import datetime
-from typing import Dict, Optional, Any, List
+from functools import lru_cache
+from typing import Dict, Optional, Any, List, Tuple
 from enum import Enum
 import aioredis
+import numpy as np
+import orjson
+
+from src.utils import calculate_sharpe_ratio, equity_curve_stats
 
 logger = logging.getLogger(__name__)
 
 
+def _dumps(obj: Any) -> bytes:
+    """Serialize a job payload, treating naive datetimes as UTC"""
+    return orjson.dumps(obj, option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY)
+
+
+_loads = orjson.loads
+
+
+def _encode_fields(fields: Dict[str, Any]) -> Dict[str, bytes]:
+    """Serialize each job field separately for storage in a Redis hash"""
+    return {name: _dumps(value) for name, value in fields.items()}
+
+
+def _decode_fields(fields: Dict) -> Dict[str, Any]:
+    """Deserialize the fields of a job hash"""
+    return {name: _loads(value) for name, value in fields.items()}
+
+
+# Applies a partial job update atomically and returns the update message to publish,
+# or 0 when the job does not exist.
+# KEYS: job hash, job log list, job index
+# ARGV: job id, ttl, max log entries, log entry ('' for none), field/value pairs
+_UPDATE_JOB_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+
+local previous_status = redis.call('HGET', KEYS[1], 'status')
+if #ARGV > 4 then
+    redis.call('HSET', KEYS[1], unpack(ARGV, 5))
+end
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+
+if ARGV[4] ~= '' then
+    redis.call('RPUSH', KEYS[2], ARGV[4])
+    redis.call('LTRIM', KEYS[2], -tonumber(ARGV[3]), -1)
+    redis.call('EXPIRE', KEYS[2], ARGV[2])
+end
+
+local current = redis.call('HMGET', KEYS[1], 'status', 'progress')
+if current[1] ~= previous_status then
+    local score = redis.call('ZSCORE', KEYS[3], ARGV[1])
+    redis.call('ZREM', 'job_status:' .. cjson.decode(previous_status), ARGV[1])
+    if score then
+        redis.call('ZADD', 'job_status:' .. cjson.decode(current[1]), score, ARGV[1])
+    end
+end
+
+return '{"job_id":' .. cjson.encode(ARGV[1]) ..
+    ',"status":' .. current[1] .. ',"progress":' .. current[2] .. '}'
+"""
+
+
+@lru_cache(maxsize=1024)
+def _job_keys(job_id: str) -> Tuple[str, str, str]:
+    """Redis key of a job, key of its log list and its update channel"""
+    return f"job:{job_id}", f"job_logs:{job_id}", f"job_updates:{job_id}"
+
+
 class JobStatus(str, Enum):
     PENDING = "pending"
     RUNNING = "running"
@@ -23,10 +87,28 @@ class JobStatus(str, Enum):
 class JobManager:
     """Manages backtest jobs with Redis for state storage"""
     
-    def __init__(self, redis_client: aioredis.Redis, db_pool=None):
+    # Most recent log entries kept per job
+    MAX_LOG_ENTRIES = 1000
+    
+    # Batches of job hashes larger than this are decoded off the event loop
+    DECODE_CHUNK_SIZE = 256
+    
+    # Progress updates closer than this (in seconds and percent) are coalesced
+    PROGRESS_INTERVAL = 0.25
+    PROGRESS_STEP = 1
+    
+    def __init__(
+        self,
+        redis_client: aioredis.Redis,
+        db_pool=None,
+        publisher: Optional[aioredis.Redis] = None
+    ):
         self.redis = redis_client
+        self.publisher = publisher or redis_client
         self.db_pool = db_pool
         self.running_jobs: Dict[str, asyncio.Task] = {}
+        self._last_published: Dict[str, Tuple[int, float]] = {}
+        self._update_script = redis_client.register_script(_UPDATE_JOB_SCRIPT)
         
     async def create_job(
         self,
@@ -37,41 +119,53 @@ class JobManager:
         """Create a new job and return job ID"""
         
         job_id = str(uuid.uuid4())
+        created_at = time.time()
         
         job_data = {
             'id': job_id,
             'type': job_type,
             'params': params,
-            'status': JobStatus.PENDING,
+            'status': JobStatus.PENDING.value,
             'progress': 0,
-            'created_at': datetime.utcnow().isoformat(),
-            'updated_at': datetime.utcnow().isoformat(),
+            'created_at': created_at,
+            'updated_at': created_at,
             'user_id': user_id,
             'result': None,
-            'error': None,
-            'logs': []
+            'error': None
         }
         
-        # Store in Redis with 24h expiry
-        await self.redis.setex(
-            f"job:{job_id}",
-            86400,  # 24 hours
-            json.dumps(job_data)
-        )
-        
-        # Add to pending queue
-        await self.redis.lpush("job_queue:pending", job_id)
+        # Store in Redis with 24h expiry, index it, queue it and wake subscribed workers in one round trip
+        key, _, _ = _job_keys(job_id)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hset(key, mapping=_encode_fields(job_data))
+            pipe.expire(key, 86400)  # 24 hours
+            self._index_job(pipe, job_id, JobStatus.PENDING, created_at)
+            pipe.lpush("job_queue:pending", job_id)
+            pipe.publish("job_queue:new", job_id)
+            await pipe.execute()
         
         logger.info(f"Created job {job_id} of type {job_type}")
         return job_id
         
-    async def get_job(self, job_id: str) -> Optional[Dict]:
-        """Get job details"""
+    async def get_job(self, job_id: str, include_logs: bool = False) -> Optional[Dict]:
+        """Get job details, with its log entries when requested"""
         
-        data = await self.redis.get(f"job:{job_id}")
-        if data:
-            return json.loads(data)
-        return None
+        key, logs_key, _ = _job_keys(job_id)
+        if not include_logs:
+            fields = await self.redis.hgetall(key)
+            return _decode_fields(fields) if fields else None
+            
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hgetall(key)
+            pipe.lrange(logs_key, 0, -1)
+            fields, logs = await pipe.execute()
+            
+        if not fields:
+            return None
+            
+        job = _decode_fields(fields)
+        job['logs'] = [_loads(entry) for entry in logs]
+        return job
         
     async def update_job(
         self,
@@ -84,44 +178,42 @@ class JobManager:
     ):
         """Update job status and progress"""
         
-        job = await self.get_job(job_id)
-        if not job:
-            logger.error(f"Job {job_id} not found")
-            return
-            
+        key, logs_key, channel = _job_keys(job_id)
+        now = time.time()
+        
+        # Only the fields that change are sent
+        changes = {'updated_at': now}
         if status:
-            job['status'] = status
+            changes['status'] = JobStatus(status).value
         if progress is not None:
-            job['progress'] = max(0, min(100, progress))
+            changes['progress'] = max(0, min(100, progress))
         if result:
-            job['result'] = result
+            changes['result'] = result
         if error:
-            job['error'] = error
-        if log_message:
-            job['logs'].append({
-                'timestamp': datetime.utcnow().isoformat(),
-                'message': log_message
-            })
-            
-        job['updated_at'] = datetime.utcnow().isoformat()
-        
-        # Store updated job
-        await self.redis.setex(
-            f"job:{job_id}",
-            86400,
-            json.dumps(job)
-        )
+            changes['error'] = error
+            
+        log_entry = _dumps({'timestamp': now, 'message': log_message}) if log_message else ''
         
-        # Publish update for real-time monitoring
-        await self.redis.publish(
-            f"job_updates:{job_id}",
-            json.dumps({
-                'job_id': job_id,
-                'status': job['status'],
-                'progress': job['progress']
-            })
-        )
+        # Apply and index the changes server-side in one atomic round trip
+        args = [job_id, 86400, self.MAX_LOG_ENTRIES, log_entry]
+        for field in _encode_fields(changes).items():
+            args.extend(field)
+            
+        message = await self._update_script(keys=[key, logs_key, "job_index"], args=args)
+        if not message:
+            logger.error(f"Job {job_id} not found")
+            return
+            
+        await self._publish_update(channel, message)
+        
+    async def _publish_update(self, channel: str, message: str):
+        """Publish an update for real-time monitoring, dropping it if Redis is slow or unavailable"""
         
+        try:
+            await self.publisher.publish(channel, message)
+        except Exception as e:
+            logger.debug(f"Dropped update on {channel}: {e}")
+            
     async def start_job(self, job_id: str, executor_func):
         """Start executing a job"""
         
@@ -148,13 +240,15 @@ class JobManager:
             if not job:
                 raise ValueError(f"Job {job_id} not found")
                 
+            # Executors await progress updates, so a slow Redis slows the job instead of queueing writes
+            async def progress_callback(progress: int, message: Optional[str] = None):
+                await self._report_progress(job_id, progress, message)
+                
             # Execute the job
             result = await executor_func(
                 job_id=job_id,
                 params=job['params'],
-                progress_callback=lambda p, msg=None: asyncio.create_task(
-                    self.update_job(job_id, progress=p, log_message=msg)
-                )
+                progress_callback=progress_callback
             )
             
             # Update job as completed
@@ -184,6 +278,28 @@ class JobManager:
         finally:
             # Remove from running jobs
             self.running_jobs.pop(job_id, None)
+            self._last_published.pop(job_id, None)
+            
+    async def _report_progress(
+        self,
+        job_id: str,
+        progress: int,
+        log_message: Optional[str] = None
+    ):
+        """Write a progress update unless it is too close to the last one written"""
+        
+        now = time.monotonic()
+        last = self._last_published.get(job_id)
+        if (
+            last is not None
+            and not log_message
+            and abs(progress - last[0]) < self.PROGRESS_STEP
+            and now - last[1] < self.PROGRESS_INTERVAL
+        ):
+            return
+            
+        self._last_published[job_id] = (progress, now)
+        await self.update_job(job_id, progress=progress, log_message=log_message)
             
     async def cancel_job(self, job_id: str) -> bool:
         """Cancel a running job"""
@@ -200,40 +316,93 @@ class JobManager:
         status: Optional[JobStatus] = None,
         limit: int = 100
     ) -> List[Dict]:
-        """List jobs with optional status filter"""
+        """List jobs with optional status filter, newest first"""
         
-        # Get all job keys
-        keys = await self.redis.keys("job:*")
+        index = self._status_index(status) if status else "job_index"
         
         jobs = []
-        for key in keys[:limit]:
-            data = await self.redis.get(key)
-            if data:
-                job = json.loads(data)
-                if status is None or job['status'] == status:
-                    jobs.append(job)
+        start = 0
+        while len(jobs) < limit:
+            job_ids = await self.redis.zrevrange(index, start, start + limit - len(jobs) - 1)
+            if not job_ids:
+                break
+                
+            found = await self._fetch_jobs([f"job:{job_id}" for job_id in job_ids])
+            jobs.extend(job for job in found if job)
+            
+            # Drop index entries of jobs that have expired since they were indexed
+            expired = [job_id for job_id, job in zip(job_ids, found) if not job]
+            if expired:
+                async with self.redis.pipeline(transaction=False) as pipe:
+                    self._unindex_jobs(pipe, expired)
+                    await pipe.execute()
                     
-        # Sort by created_at descending
-        jobs.sort(key=lambda x: x['created_at'], reverse=True)
-        
+            start += len(job_ids) - len(expired)
+            
         return jobs
         
-    async def cleanup_old_jobs(self, days: int = 7):
+    async def cleanup_old_jobs(self, days: int = 7, batch_size: int = 500):
         """Clean up jobs older than specified days"""
         
-        cutoff = datetime.utcnow().timestamp() - (days * 86400)
+        cutoff = time.time() - (days * 86400)
         
-        keys = await self.redis.keys("job:*")
-        
-        for key in keys:
-            data = await self.redis.get(key)
-            if data:
-                job = json.loads(data)
-                created_at = datetime.fromisoformat(job['created_at']).timestamp()
+        deleted = 0
+        while True:
+            expired = await self.redis.zrangebyscore("job_index", "-inf", cutoff, start=0, num=batch_size)
+            if not expired:
+                break
+                
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for job_id in expired:
+                    pipe.delete(f"job:{job_id}", f"job_logs:{job_id}")
+                self._unindex_jobs(pipe, expired)
+                await pipe.execute()
                 
-                if created_at < cutoff:
-                    await self.redis.delete(key)
-                    logger.info(f"Deleted old job {job['id']}")
+            deleted += len(expired)
+            
+        if deleted:
+            logger.info(f"Deleted {deleted} old jobs")
+            
+    @staticmethod
+    def _status_index(status: str) -> str:
+        """Key of the sorted set indexing jobs in the given status"""
+        return f"job_status:{JobStatus(status).value}"
+        
+    def _index_job(self, pipe, job_id: str, status: str, created_ts: float):
+        """Queue index updates for a job, scored by its creation time"""
+        
+        entry = {job_id: created_ts}
+        pipe.zadd("job_index", entry)
+        pipe.zadd(self._status_index(status), entry)
+        
+    def _unindex_jobs(self, pipe, job_ids: List[str]):
+        """Queue removal of jobs from every index"""
+        
+        pipe.zrem("job_index", *job_ids)
+        for status in JobStatus:
+            pipe.zrem(self._status_index(status), *job_ids)
+            
+    async def _fetch_jobs(self, keys: List) -> List[Optional[Dict]]:
+        """Read many job hashes in one pipeline, with None for missing ones"""
+        
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.hgetall(key)
+            values = await pipe.execute()
+            
+        if len(values) <= self.DECODE_CHUNK_SIZE:
+            return self._decode_jobs(values)
+            
+        chunks = await asyncio.gather(*(
+            asyncio.to_thread(self._decode_jobs, values[i:i + self.DECODE_CHUNK_SIZE])
+            for i in range(0, len(values), self.DECODE_CHUNK_SIZE)
+        ))
+        return [job for chunk in chunks for job in chunk]
+        
+    @staticmethod
+    def _decode_jobs(values: List[Dict]) -> List[Optional[Dict]]:
+        """Decode fetched job hashes, with None for missing ones"""
+        return [_decode_fields(fields) if fields else None for fields in values]
 
 
 class BacktestJobExecutor:
@@ -248,6 +417,7 @@ class BacktestJobExecutor:
         self.engine = backtest_engine
         self.strategy_manager = strategy_manager
         self.db = db_pool
+        self.max_concurrent_tokens = 16  # Tokens processed in parallel per job
         
     async def execute_backtest_job(
         self,
@@ -276,7 +446,6 @@ class BacktestJobExecutor:
             
             # Calculate progress increments
             progress_per_token = 60 / len(token_addresses)  # 60% for token processing
-            current_progress = 20
             
             # Create backtest record
             async with self.db.acquire() as conn:
@@ -286,30 +455,37 @@ class BacktestJobExecutor:
                     RETURNING id
                 """, strategy_id, (start_date, end_date))
                 
-            # Process each token with progress updates
+            # Process tokens concurrently with progress updates as each one finishes
+            semaphore = asyncio.Semaphore(self.max_concurrent_tokens)
+            completed = 0
+            
+            async def process(token_address: str) -> Dict:
+                nonlocal completed
+                async with semaphore:
+                    # Run backtest for this token
+                    # (Simplified - in real implementation would use the engine)
+                    token_result = await self._process_token(
+                        token_address,
+                        strategy,
+                        start_date,
+                        end_date
+                    )
+                    
+                    completed += 1
+                    await progress_callback(
+                        int(20 + completed * progress_per_token),
+                        f"Processed token {completed}/{len(token_addresses)}: {token_address[:8]}..."
+                    )
+                    return token_result
+                    
+            token_results = await asyncio.gather(*(process(a) for a in token_addresses))
+            
             all_signals = []
             all_trades = []
-            
-            for i, token_address in enumerate(token_addresses):
-                await progress_callback(
-                    int(current_progress),
-                    f"Processing token {i+1}/{len(token_addresses)}: {token_address[:8]}..."
-                )
-                
-                # Run backtest for this token
-                # (Simplified - in real implementation would use the engine)
-                token_result = await self._process_token(
-                    token_address,
-                    strategy,
-                    start_date,
-                    end_date
-                )
-                
+            for token_result in token_results:
                 all_signals.extend(token_result.get('signals', []))
                 all_trades.extend(token_result.get('trades', []))
                 
-                current_progress += progress_per_token
-                
             await progress_callback(80, "Calculating portfolio metrics")
             
             # Calculate metrics
@@ -370,14 +546,25 @@ class BacktestJobExecutor:
                 'max_drawdown': 0
             }
             
-        # Simplified metric calculation
-        winning_trades = sum(1 for t in trades if t.get('pnl', 0) > 0)
-        total_pnl = sum(t.get('pnl', 0) for t in trades)
+        pnl = np.fromiter(
+            (t.get('pnl', 0) for t in trades),
+            dtype=np.float64,
+            count=len(trades)
+        )
+        winning_trades = int((pnl > 0).sum())
+        total_pnl = float(pnl.sum())
+        
+        # Per-trade returns on the equity held before each trade
+        equity_before = initial_capital + np.concatenate(([0.0], np.cumsum(pnl[:-1])))
+        returns = np.divide(pnl, equity_before, out=np.zeros_like(pnl), where=equity_before > 0)
+        _, _, _, max_drawdown = equity_curve_stats(pnl, float(initial_capital))
         
         return {
             'total_return': total_pnl,
             'total_return_pct': (total_pnl / initial_capital) * 100,
-            'win_rate': winning_trades / len(trades) if trades else 0,
+            'win_rate': winning_trades / len(trades),
+            'sharpe_ratio': float(calculate_sharpe_ratio(returns)),
+            'max_drawdown': max_drawdown * 100,
             'total_trades': len(trades),
             'winning_trades': winning_trades,
             'losing_trades': len(trades) - winning_trades
@@ -393,31 +580,47 @@ class BacktestJobExecutor:
         """Store backtest results"""
         
         async with self.db.acquire() as conn:
-            # Update backtest summary
-            await conn.execute("""
-                UPDATE backtest_results
-                SET 
-                    total_signals = $2,
-                    trades_executed = $3,
-                    win_rate = $4,
-                    total_pnl = $5,
-                    status = 'completed',
-                    completed_at = NOW()
-                WHERE id = $1
-            """, backtest_id, len(signals), len(trades),
-                metrics.get('win_rate', 0), metrics.get('total_return', 0))
-                
-            # Store individual trades
-            for trade in trades:
+            async with conn.transaction():
+                # Update backtest summary
                 await conn.execute("""
-                    INSERT INTO backtest_trades (
-                        backtest_id, token_address, signal_time,
-                        entry_time, entry_price, exit_time, exit_price,
-                        pnl_percent, pnl_usd, exit_reason
-                    ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
-                """, backtest_id, trade['token_address'], trade['signal_time'],
-                    trade['entry_time'], trade['entry_price'], trade['exit_time'],
-                    trade['exit_price'], trade['pnl_percent'], trade['pnl_usd'],
-                    trade['exit_reason'])
+                    UPDATE backtest_results
+                    SET 
+                        total_signals = $2,
+                        trades_executed = $3,
+                        win_rate = $4,
+                        total_pnl = $5,
+                        status = 'completed',
+                        completed_at = NOW()
+                    WHERE id = $1
+                """, backtest_id, len(signals), len(trades),
+                    metrics.get('win_rate', 0), metrics.get('total_return', 0))
+                    
+                # Store individual trades in a single COPY
+                if trades:
+                    records = [
+                        (
+                            backtest_id,
+                            trade['token_address'],
+                            trade['signal_time'],
+                            trade['entry_time'],
+                            trade['entry_price'],
+                            trade['exit_time'],
+                            trade['exit_price'],
+                            trade['pnl_percent'],
+                            trade['pnl_usd'],
+                            trade['exit_reason']
+                        )
+                        for trade in trades
+                    ]
+                    
+                    await conn.copy_records_to_table(
+                        'backtest_trades',
+                        records=records,
+                        columns=[
+                            'backtest_id', 'token_address', 'signal_time',
+                            'entry_time', 'entry_price', 'exit_time', 'exit_price',
+                            'pnl_percent', 'pnl_usd', 'exit_reason'
+                        ]
+                    )
 # Backward compatibility alias
 BacktestJobManager = JobManager
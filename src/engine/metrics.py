@@ -1,28 +1,123 @@
 """Performance metrics calculation for backtesting"""
 
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
+from dataclasses import dataclass, replace
 from datetime import datetime, timedelta
 import numpy as np
 import pandas as pd
-from collections import defaultdict
 import logging
 
+from ._kernels import (
+    parse_timestamps,
+    drawdown_stats,
+    moments,
+    downside_moments,
+    gain_loss_sums,
+    longest_drawdown,
+    from_epoch_ns
+)
+
 logger = logging.getLogger(__name__)
 
+_NS_PER_MINUTE = 60 * 1_000_000_000
+_NS_PER_HOUR = 60 * _NS_PER_MINUTE
+_NS_PER_DAY = 24 * _NS_PER_HOUR
+
+# 1970-01-01 was a Thursday (Monday = 0)
+_EPOCH_WEEKDAY = 3
+_WEEKDAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+
+@dataclass
+class TradeArray:
+    """Closed trades as parallel arrays, with times in epoch nanoseconds"""
+    
+    entry_time: np.ndarray
+    exit_time: np.ndarray
+    pnl_percent: np.ndarray
+    pnl_usd: np.ndarray
+    tz_aware: bool = False
+    exit_sorted: bool = False
+    
+    @classmethod
+    def from_dicts(cls, trades: List[Dict]) -> 'TradeArray':
+        """Read trade dicts (entry_time, exit_time, net_pnl_percent, pnl_usd) once into arrays"""
+        
+        n = len(trades)
+        return cls(
+            entry_time=parse_timestamps([t['entry_time'] for t in trades]),
+            exit_time=parse_timestamps([t['exit_time'] for t in trades]),
+            pnl_percent=np.fromiter((t.get('net_pnl_percent', 0) for t in trades), dtype=np.float64, count=n),
+            pnl_usd=np.fromiter((t.get('pnl_usd', 0) for t in trades), dtype=np.float64, count=n),
+            tz_aware=n > 0 and getattr(trades[0]['exit_time'], 'tzinfo', None) is not None
+        )
+        
+    def __len__(self) -> int:
+        return len(self.pnl_percent)
+        
+    def reindex(self, order: np.ndarray) -> 'TradeArray':
+        """Trades taken in the given index order"""
+        return replace(
+            self,
+            entry_time=self.entry_time[order],
+            exit_time=self.exit_time[order],
+            pnl_percent=self.pnl_percent[order],
+            pnl_usd=self.pnl_usd[order],
+            exit_sorted=False
+        )
+        
+    def sorted_by_exit(self) -> 'TradeArray':
+        """Trades stably ordered by exit time, skipping the sort when already in order"""
+        if self.exit_sorted:
+            return self
+        if np.all(self.exit_time[1:] >= self.exit_time[:-1]):
+            return replace(self, exit_sorted=True)
+        return replace(self.reindex(np.argsort(self.exit_time, kind='stable')), exit_sorted=True)
+        
+    def to_datetime(self, timestamp_ns: int) -> datetime:
+        """Datetime for one of this array's timestamps, naive UTC unless the trades were tz-aware"""
+        moment = from_epoch_ns(int(timestamp_ns))
+        return moment if self.tz_aware else moment.replace(tzinfo=None)
+        
+
+TradeInput = Union[List[Dict], TradeArray]
+
+
+def prepare_trade_views(trades: TradeInput) -> TradeArray:
+    """
+    Trades read and sorted by exit time once, for callers computing both
+    trade and portfolio metrics. Both treat the view as listed in exit
+    order: streaks and compounding follow exits, and the portfolio curve
+    starts at the entry of the first trade to exit.
+    """
+    
+    if not isinstance(trades, TradeArray):
+        trades = TradeArray.from_dicts(trades)
+    return trades.sorted_by_exit()
+
 
 class MetricsCalculator:
     """Calculate comprehensive performance metrics"""
     
     @staticmethod
-    def calculate_trade_metrics(trades: List[Dict]) -> Dict:
-        """Calculate metrics from list of trades"""
+    def calculate_trade_metrics(trades: TradeInput, dtype: np.dtype = np.float64) -> Dict:
+        """Calculate metrics from list of trades (dtype sets the precision of the returns series)"""
         
-        if not trades:
+        if len(trades) == 0:
             return MetricsCalculator._empty_metrics()
             
         # Extract data
-        pnls = np.array([t.get('net_pnl_percent', 0) for t in trades])
-        returns = pnls / 100  # Convert to decimal
+        if not isinstance(trades, TradeArray):
+            trades = TradeArray.from_dicts(trades)
+            
+        pnls = trades.pnl_percent
+        returns = (pnls / 100).astype(dtype, copy=False)  # Convert to decimal
+        entry_times = trades.entry_time
+        exit_times = trades.exit_time
+        
+        equity_stats = drawdown_stats(returns, True)
+        mean_pnl, std_pnl, skewness, kurtosis = moments(pnls)
+        return_stats = downside_moments(returns)
         
         # Basic metrics
         metrics = {
@@ -31,11 +126,11 @@ class MetricsCalculator:
             'losing_trades': np.sum(pnls < 0),
             'breakeven_trades': np.sum(pnls == 0),
             'win_rate': np.mean(pnls > 0) * 100,
-            'avg_pnl': np.mean(pnls),
+            'avg_pnl': mean_pnl,
             'median_pnl': np.median(pnls),
-            'std_pnl': np.std(pnls),
-            'skewness': MetricsCalculator._calculate_skewness(pnls),
-            'kurtosis': MetricsCalculator._calculate_kurtosis(pnls)
+            'std_pnl': std_pnl,
+            'skewness': skewness,
+            'kurtosis': kurtosis
         }
         
         # Win/Loss analysis
@@ -53,21 +148,26 @@ class MetricsCalculator:
         })
         
         # Risk metrics
+        var_95 = np.percentile(pnls, 5)  # Value at Risk 95%
+        
         metrics.update({
             'profit_factor': MetricsCalculator._calculate_profit_factor(pnls),
-            'sharpe_ratio': MetricsCalculator._calculate_sharpe_ratio(returns),
-            'sortino_ratio': MetricsCalculator._calculate_sortino_ratio(returns),
-            'calmar_ratio': MetricsCalculator._calculate_calmar_ratio(returns),
+            'sharpe_ratio': MetricsCalculator._calculate_sharpe_ratio(returns, return_stats=return_stats),
+            'sortino_ratio': MetricsCalculator._calculate_sortino_ratio(returns, return_stats=return_stats),
+            'calmar_ratio': MetricsCalculator._calculate_calmar_ratio(returns, equity_stats),
             'omega_ratio': MetricsCalculator._calculate_omega_ratio(returns),
-            'max_drawdown': MetricsCalculator._calculate_max_drawdown_from_returns(returns),
-            'max_drawdown_duration': MetricsCalculator._calculate_max_drawdown_duration(trades, returns),
-            'recovery_factor': MetricsCalculator._calculate_recovery_factor(returns),
-            'var_95': np.percentile(pnls, 5),  # Value at Risk 95%
-            'cvar_95': np.mean(pnls[pnls <= np.percentile(pnls, 5)])  # Conditional VaR
+            'max_drawdown': MetricsCalculator._calculate_max_drawdown_from_returns(returns, equity_stats),
+            'max_drawdown_duration': MetricsCalculator._calculate_max_drawdown_duration(
+                exit_times if trades.exit_sorted else np.sort(exit_times),
+                returns
+            ),
+            'recovery_factor': MetricsCalculator._calculate_recovery_factor(returns, equity_stats),
+            'var_95': var_95,
+            'cvar_95': np.mean(pnls[pnls <= var_95])  # Conditional VaR
         })
         
         # Trade analysis
-        hold_durations = [(t['exit_time'] - t['entry_time']).total_seconds() / 60 for t in trades]
+        hold_durations = (exit_times - entry_times) / _NS_PER_MINUTE
         
         metrics.update({
             'avg_hold_duration_minutes': np.mean(hold_durations),
@@ -84,34 +184,40 @@ class MetricsCalculator:
         })
         
         # By time period
-        metrics['by_hour'] = MetricsCalculator._calculate_metrics_by_hour(trades)
-        metrics['by_day_of_week'] = MetricsCalculator._calculate_metrics_by_day_of_week(trades)
+        entry_hours = entry_times // _NS_PER_HOUR
+        metrics['by_hour'] = MetricsCalculator._calculate_metrics_by_hour(entry_hours % 24, pnls)
+        metrics['by_day_of_week'] = MetricsCalculator._calculate_metrics_by_day_of_week(
+            (entry_hours // 24 + _EPOCH_WEEKDAY) % 7, pnls
+        )
         
         return metrics
         
     @staticmethod
     def calculate_portfolio_metrics(
-        trades: List[Dict],
-        initial_capital: float
+        trades: TradeInput,
+        initial_capital: float,
+        dtype: np.dtype = np.float64
     ) -> Dict:
-        """Calculate portfolio-level metrics"""
+        """Calculate portfolio-level metrics (dtype sets the precision of the equity curve)"""
         
-        if not trades:
+        if len(trades) == 0:
             return MetricsCalculator._empty_portfolio_metrics(initial_capital)
             
-        # Build equity curve
-        equity_curve = [initial_capital]
-        timestamps = [trades[0]['entry_time']]
+        if not isinstance(trades, TradeArray):
+            trades = TradeArray.from_dicts(trades)
+            
+        # Build equity curve in exit order, point i being reached at timestamps[i] (epoch ns)
+        by_exit = trades.sorted_by_exit()
+        timestamps = np.concatenate((trades.entry_time[:1], by_exit.exit_time))
         
-        current_capital = initial_capital
+        equity_array = np.empty(len(trades) + 1, dtype=np.float64)
+        equity_array[0] = initial_capital
+        equity_array[1:] = by_exit.pnl_usd
+        np.cumsum(equity_array, out=equity_array)
         
-        for trade in sorted(trades, key=lambda x: x['exit_time']):
-            pnl_usd = trade.get('pnl_usd', 0)
-            current_capital += pnl_usd
-            equity_curve.append(current_capital)
-            timestamps.append(trade['exit_time'])
-            
-        equity_array = np.array(equity_curve)
+        # Totals are taken at full precision before any narrowing
+        current_capital = float(equity_array[-1])
+        equity_array = equity_array.astype(dtype, copy=False)
         
         # Portfolio returns
         portfolio_returns = np.diff(equity_array) / equity_array[:-1]
@@ -120,7 +226,7 @@ class MetricsCalculator:
         total_return = (current_capital - initial_capital) / initial_capital
         
         # Annualized metrics
-        days = (timestamps[-1] - timestamps[0]).days
+        days = int((timestamps[-1] - timestamps[0]) // _NS_PER_DAY)
         years = days / 365.25
         
         if years > 0:
@@ -139,22 +245,23 @@ class MetricsCalculator:
             'annual_sharpe': annual_sharpe,
             'max_equity': np.max(equity_array),
             'min_equity': np.min(equity_array),
-            'equity_peak_time': timestamps[np.argmax(equity_array)],
-            'equity_trough_time': timestamps[np.argmin(equity_array)],
+            'equity_peak_time': trades.to_datetime(timestamps[np.argmax(equity_array)]),
+            'equity_trough_time': trades.to_datetime(timestamps[np.argmin(equity_array)]),
             'time_in_market_days': days,
             'avg_capital_deployed': np.mean(equity_array),
             'capital_efficiency': total_return / (np.mean(equity_array) / initial_capital)
         }
         
         # Risk metrics
-        max_dd, dd_start, dd_end = MetricsCalculator._calculate_max_drawdown_details(equity_array)
+        equity_stats = drawdown_stats(equity_array, False)
+        max_dd, dd_start, dd_end = MetricsCalculator._calculate_max_drawdown_details(equity_array, equity_stats)
         
         metrics.update({
             'max_drawdown': max_dd * 100,
-            'max_drawdown_start': timestamps[dd_start] if dd_start < len(timestamps) else None,
-            'max_drawdown_end': timestamps[dd_end] if dd_end < len(timestamps) else None,
+            'max_drawdown_start': trades.to_datetime(timestamps[dd_start]) if dd_start < len(timestamps) else None,
+            'max_drawdown_end': trades.to_datetime(timestamps[dd_end]) if dd_end < len(timestamps) else None,
             'max_drawdown_recovery': MetricsCalculator._calculate_recovery_time(equity_array, dd_end, timestamps),
-            'ulcer_index': MetricsCalculator._calculate_ulcer_index(equity_array),
+            'ulcer_index': MetricsCalculator._calculate_ulcer_index(equity_array, equity_stats),
             'stability': MetricsCalculator._calculate_stability(equity_array)
         })
         
@@ -198,8 +305,7 @@ class MetricsCalculator:
     @staticmethod
     def _calculate_profit_factor(pnls: np.ndarray) -> float:
         """Calculate profit factor"""
-        gross_profits = np.sum(pnls[pnls > 0])
-        gross_losses = abs(np.sum(pnls[pnls < 0]))
+        gross_profits, gross_losses = gain_loss_sums(pnls, 0.0)
         
         if gross_losses == 0:
             return float('inf') if gross_profits > 0 else 0
@@ -207,44 +313,51 @@ class MetricsCalculator:
         return gross_profits / gross_losses
         
     @staticmethod
-    def _calculate_sharpe_ratio(returns: np.ndarray, risk_free_rate: float = 0) -> float:
-        """Calculate Sharpe ratio"""
-        if len(returns) == 0 or np.std(returns) == 0:
+    def _calculate_sharpe_ratio(
+        returns: np.ndarray,
+        risk_free_rate: float = 0,
+        return_stats: Optional[Tuple] = None
+    ) -> float:
+        """Calculate Sharpe ratio (return_stats is downside_moments of the excess returns)"""
+        if len(returns) == 0:
+            return 0
+            
+        mean, std, _, _ = return_stats or downside_moments(returns - risk_free_rate)
+        if std == 0:
             return 0
             
-        excess_returns = returns - risk_free_rate
-        return np.mean(excess_returns) / np.std(excess_returns) * np.sqrt(252)
+        return mean / std * np.sqrt(252)
         
     @staticmethod
-    def _calculate_sortino_ratio(returns: np.ndarray, risk_free_rate: float = 0) -> float:
-        """Calculate Sortino ratio"""
+    def _calculate_sortino_ratio(
+        returns: np.ndarray,
+        risk_free_rate: float = 0,
+        return_stats: Optional[Tuple] = None
+    ) -> float:
+        """Calculate Sortino ratio (return_stats is downside_moments of the excess returns)"""
         if len(returns) == 0:
             return 0
             
-        excess_returns = returns - risk_free_rate
-        downside_returns = excess_returns[excess_returns < 0]
+        mean, _, n_downside, downside_std = return_stats or downside_moments(returns - risk_free_rate)
         
-        if len(downside_returns) == 0:
-            return float('inf') if np.mean(excess_returns) > 0 else 0
+        if n_downside == 0:
+            return float('inf') if mean > 0 else 0
             
-        downside_std = np.std(downside_returns)
         if downside_std == 0:
             return 0
             
-        return np.mean(excess_returns) / downside_std * np.sqrt(252)
+        return mean / downside_std * np.sqrt(252)
         
     @staticmethod
-    def _calculate_calmar_ratio(returns: np.ndarray) -> float:
+    def _calculate_calmar_ratio(returns: np.ndarray, equity_stats: Optional[Tuple] = None) -> float:
         """Calculate Calmar ratio"""
         if len(returns) == 0:
             return 0
             
-        cumulative = np.cumprod(1 + returns)
-        total_return = cumulative[-1] - 1
+        final_equity, max_dd = (equity_stats or drawdown_stats(returns, True))[:2]
+        total_return = final_equity - 1
         annual_return = (1 + total_return) ** (252 / len(returns)) - 1
         
-        max_dd = MetricsCalculator._calculate_max_drawdown_from_returns(returns)
-        
         if max_dd == 0:
             return float('inf') if annual_return > 0 else 0
             
@@ -256,42 +369,28 @@ class MetricsCalculator:
         if len(returns) == 0:
             return 0
             
-        gains = returns[returns > threshold] - threshold
-        losses = threshold - returns[returns <= threshold]
+        gains, losses = gain_loss_sums(returns, threshold)
         
-        if np.sum(losses) == 0:
-            return float('inf') if np.sum(gains) > 0 else 0
+        if losses == 0:
+            return float('inf') if gains > 0 else 0
             
-        return np.sum(gains) / np.sum(losses)
+        return gains / losses
         
     @staticmethod
-    def _calculate_max_drawdown_from_returns(returns: np.ndarray) -> float:
+    def _calculate_max_drawdown_from_returns(returns: np.ndarray, equity_stats: Optional[Tuple] = None) -> float:
         """Calculate maximum drawdown from returns"""
         if len(returns) == 0:
             return 0
             
-        cumulative = np.cumprod(1 + returns)
-        running_max = np.maximum.accumulate(cumulative)
-        drawdowns = (cumulative - running_max) / running_max
-        
-        return abs(np.min(drawdowns))
+        return (equity_stats or drawdown_stats(returns, True))[1]
         
     @staticmethod
-    def _calculate_max_drawdown_details(equity: np.ndarray) -> Tuple[float, int, int]:
+    def _calculate_max_drawdown_details(equity: np.ndarray, equity_stats: Optional[Tuple] = None) -> Tuple[float, int, int]:
         """Calculate max drawdown with start and end indices"""
         if len(equity) == 0:
             return 0, 0, 0
             
-        running_max = np.maximum.accumulate(equity)
-        drawdowns = (equity - running_max) / running_max
-        
-        max_dd_idx = np.argmin(drawdowns)
-        max_dd = abs(drawdowns[max_dd_idx])
-        
-        # Find start (last peak before max drawdown)
-        start_idx = np.where(equity[:max_dd_idx] == running_max[:max_dd_idx])[0]
-        start_idx = start_idx[-1] if len(start_idx) > 0 else 0
-        
+        _, max_dd, start_idx, max_dd_idx, _ = equity_stats or drawdown_stats(equity, False)
         return max_dd, start_idx, max_dd_idx
         
     @staticmethod
@@ -300,17 +399,12 @@ class MetricsCalculator:
         if len(condition) == 0:
             return 0
             
-        max_streak = 0
-        current_streak = 0
-        
-        for value in condition:
-            if value:
-                current_streak += 1
-                max_streak = max(max_streak, current_streak)
-            else:
-                current_streak = 0
-                
-        return max_streak
+        # Run boundaries: +1 where a True run starts, -1 just past where it ends
+        edges = np.diff(np.concatenate(([0], condition.astype(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        
+        return int((ends - starts).max()) if len(starts) > 0 else 0
         
     @staticmethod
     def _calculate_current_streak(pnls: np.ndarray) -> Dict:
@@ -318,55 +412,33 @@ class MetricsCalculator:
         if len(pnls) == 0:
             return {'type': 'none', 'count': 0}
             
-        streak_count = 1
         streak_type = 'win' if pnls[-1] > 0 else 'loss'
         
-        for i in range(len(pnls) - 2, -1, -1):
-            if (pnls[i] > 0 and streak_type == 'win') or (pnls[i] < 0 and streak_type == 'loss'):
-                streak_count += 1
-            else:
-                break
+        # The last trade always counts; earlier ones extend the streak until the first break
+        extends = pnls[:-1] > 0 if streak_type == 'win' else pnls[:-1] < 0
+        breaks = np.flatnonzero(~extends)
+        streak_count = len(pnls) - 1 - breaks[-1] if len(breaks) > 0 else len(pnls)
                 
-        return {'type': streak_type, 'count': streak_count}
+        return {'type': streak_type, 'count': int(streak_count)}
         
     @staticmethod
     def _calculate_skewness(data: np.ndarray) -> float:
         """Calculate skewness"""
-        if len(data) < 3:
-            return 0
-            
-        mean = np.mean(data)
-        std = np.std(data)
-        
-        if std == 0:
-            return 0
-            
-        return np.mean(((data - mean) / std) ** 3)
+        return moments(data)[2]
         
     @staticmethod
     def _calculate_kurtosis(data: np.ndarray) -> float:
         """Calculate excess kurtosis"""
-        if len(data) < 4:
-            return 0
-            
-        mean = np.mean(data)
-        std = np.std(data)
-        
-        if std == 0:
-            return 0
-            
-        return np.mean(((data - mean) / std) ** 4) - 3
+        return moments(data)[3]
         
     @staticmethod
-    def _calculate_ulcer_index(equity: np.ndarray) -> float:
+    def _calculate_ulcer_index(equity: np.ndarray, equity_stats: Optional[Tuple] = None) -> float:
         """Calculate Ulcer Index (measures downside volatility)"""
         if len(equity) < 2:
             return 0
             
-        running_max = np.maximum.accumulate(equity)
-        drawdowns = ((equity - running_max) / running_max) * 100
-        
-        return np.sqrt(np.mean(drawdowns ** 2))
+        sum_squared_drawdowns = (equity_stats or drawdown_stats(equity, False))[4]
+        return np.sqrt(sum_squared_drawdowns / len(equity)) * 100
         
     @staticmethod
     def _calculate_stability(equity: np.ndarray) -> float:
@@ -374,29 +446,29 @@ class MetricsCalculator:
         if len(equity) < 2:
             return 0
             
-        x = np.arange(len(equity))
-        
-        # Linear regression
-        slope, intercept = np.polyfit(x, equity, 1)
-        predicted = slope * x + intercept
-        
-        # R-squared
-        ss_res = np.sum((equity - predicted) ** 2)
-        ss_tot = np.sum((equity - np.mean(equity)) ** 2)
+        # Closed-form least squares against x = 0..n-1, on the mean-centred curve
+        n = len(equity)
+        centered = equity - np.mean(equity)
+        ss_tot = np.dot(centered, centered)
         
         if ss_tot == 0:
-            return 1 if ss_res == 0 else 0
+            return 1  # A flat curve is fitted exactly
             
+        sxy = np.dot(np.arange(n, dtype=np.float64), centered)
+        sxx = n * (n * n - 1) / 12  # Sum of squared deviations of 0..n-1
+        
+        # R-squared
+        ss_res = ss_tot - sxy * sxy / sxx
         return 1 - (ss_res / ss_tot)
         
     @staticmethod
-    def _calculate_recovery_factor(returns: np.ndarray) -> float:
+    def _calculate_recovery_factor(returns: np.ndarray, equity_stats: Optional[Tuple] = None) -> float:
         """Calculate recovery factor (total return / max drawdown)"""
         if len(returns) == 0:
             return 0
             
-        total_return = np.prod(1 + returns) - 1
-        max_dd = MetricsCalculator._calculate_max_drawdown_from_returns(returns)
+        final_equity, max_dd = (equity_stats or drawdown_stats(returns, True))[:2]
+        total_return = final_equity - 1
         
         if max_dd == 0:
             return float('inf') if total_return > 0 else 0
@@ -404,42 +476,20 @@ class MetricsCalculator:
         return total_return / max_dd
         
     @staticmethod
-    def _calculate_max_drawdown_duration(trades: List[Dict], returns: np.ndarray) -> int:
-        """Calculate maximum drawdown duration in days"""
-        if not trades or len(returns) == 0:
+    def _calculate_max_drawdown_duration(sorted_exit_times: np.ndarray, returns: np.ndarray) -> int:
+        """Calculate maximum drawdown duration in days from sorted epoch-ns exit times"""
+        if len(sorted_exit_times) == 0 or len(returns) == 0:
             return 0
             
-        # Build equity curve with timestamps
-        timestamps = [t['exit_time'] for t in sorted(trades, key=lambda x: x['exit_time'])]
-        cumulative = np.cumprod(1 + returns)
-        
-        # Find drawdown periods
-        running_max = np.maximum.accumulate(cumulative)
-        in_drawdown = cumulative < running_max
-        
-        max_duration = 0
-        current_duration = 0
-        dd_start = None
-        
-        for i, in_dd in enumerate(in_drawdown):
-            if in_dd:
-                if dd_start is None:
-                    dd_start = timestamps[i]
-                current_duration = (timestamps[i] - dd_start).days
-                max_duration = max(max_duration, current_duration)
-            else:
-                dd_start = None
-                current_duration = 0
-                
-        return max_duration
+        return int(longest_drawdown(returns, sorted_exit_times) // _NS_PER_DAY)
         
     @staticmethod
     def _calculate_recovery_time(
         equity: np.ndarray,
         dd_end_idx: int,
-        timestamps: List[datetime]
+        timestamps: np.ndarray
     ) -> Optional[int]:
-        """Calculate time to recover from drawdown"""
+        """Calculate days to recover from drawdown, given epoch-ns timestamps"""
         if dd_end_idx >= len(equity) - 1:
             return None  # Still in drawdown
             
@@ -450,43 +500,35 @@ class MetricsCalculator:
         for i in range(dd_end_idx + 1, len(equity)):
             if equity[i] >= peak_value:
                 # Recovered
-                return (timestamps[i] - timestamps[dd_end_idx]).days
+                return int((timestamps[i] - timestamps[dd_end_idx]) // _NS_PER_DAY)
                 
         return None  # Not recovered yet
         
     @staticmethod
-    def _calculate_metrics_by_hour(trades: List[Dict]) -> Dict:
-        """Calculate metrics by hour of day"""
-        hourly_pnls = defaultdict(list)
+    def _bucket_metrics(buckets: np.ndarray, pnls: np.ndarray, n_buckets: int) -> List[Tuple[int, Dict]]:
+        """Trade count, average P&L and win rate for each non-empty bucket"""
+        counts = np.bincount(buckets, minlength=n_buckets)
+        sums = np.bincount(buckets, weights=pnls, minlength=n_buckets)
+        wins = np.bincount(buckets, weights=pnls > 0, minlength=n_buckets)
+        
+        return [
+            (bucket, {
+                'trades': int(counts[bucket]),
+                'avg_pnl': sums[bucket] / counts[bucket],
+                'win_rate': wins[bucket] / counts[bucket] * 100
+            })
+            for bucket in np.flatnonzero(counts).tolist()
+        ]
         
-        for trade in trades:
-            hour = trade['entry_time'].hour
-            hourly_pnls[hour].append(trade.get('net_pnl_percent', 0))
-            
-        return {
-            hour: {
-                'trades': len(pnls),
-                'avg_pnl': np.mean(pnls),
-                'win_rate': np.mean(np.array(pnls) > 0) * 100
-            }
-            for hour, pnls in hourly_pnls.items()
-        }
+    @staticmethod
+    def _calculate_metrics_by_hour(hours: np.ndarray, pnls: np.ndarray) -> Dict:
+        """Calculate metrics by hour of day"""
+        return dict(MetricsCalculator._bucket_metrics(hours, pnls, 24))
         
     @staticmethod
-    def _calculate_metrics_by_day_of_week(trades: List[Dict]) -> Dict:
-        """Calculate metrics by day of week"""
-        daily_pnls = defaultdict(list)
-        days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        
-        for trade in trades:
-            dow = trade['entry_time'].weekday()
-            daily_pnls[days[dow]].append(trade.get('net_pnl_percent', 0))
-            
+    def _calculate_metrics_by_day_of_week(weekdays: np.ndarray, pnls: np.ndarray) -> Dict:
+        """Calculate metrics by day of week (Monday = 0)"""
         return {
-            day: {
-                'trades': len(pnls),
-                'avg_pnl': np.mean(pnls),
-                'win_rate': np.mean(np.array(pnls) > 0) * 100
-            }
-            for day, pnls in daily_pnls.items()
-        }
\ No newline at end of file
+            _WEEKDAYS[dow]: stats
+            for dow, stats in MetricsCalculator._bucket_metrics(weekdays, pnls, 7)
+        }
@@ -1,16 +1,75 @@
 """Trade execution simulator with realistic market conditions"""
 
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 from datetime import datetime, timedelta
 import numpy as np
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Exit slippage multiplier per urgency level
+URGENCY_MULTIPLIERS = {
+    'patient': 0.5,
+    'normal': 1.0,
+    'urgent': 1.5
+}
+
+
+def _size_impacts(size_usd: np.ndarray, liquidity_usd: np.ndarray) -> np.ndarray:
+    """TradeSimulator._calculate_size_impact for arrays of sizes and liquidities"""
+    
+    size_usd = np.asarray(size_usd, dtype=np.float64)
+    liquidity_usd = np.asarray(liquidity_usd, dtype=np.float64)
+    has_liquidity = liquidity_usd > 0
+    
+    # Size as fraction of liquidity; pools without liquidity are overridden below
+    size_percent = np.divide(
+        size_usd,
+        liquidity_usd,
+        out=np.zeros(np.broadcast(size_usd, liquidity_usd).shape),
+        where=has_liquidity
+    )
+    
+    impact = np.select(
+        [size_percent < 0.01, size_percent < 0.05, size_percent < 0.10],
+        [size_percent * 0.1, 0.001 + (size_percent - 0.01) * 0.5, 0.021 + (size_percent - 0.05) * 1.0],
+        default=0.071 + (size_percent - 0.10) * 2.0
+    )
+    return np.where(has_liquidity, np.minimum(impact, 0.5), 0.5)
+
+
+def _fill_rates(
+    size_usd: np.ndarray,
+    liquidity_usd: np.ndarray,
+    min_fill_rate: float,
+    max_fill_rate: float
+) -> np.ndarray:
+    """TradeSimulator._calculate_fill_rate for arrays of sizes and liquidities"""
+    
+    size_usd = np.asarray(size_usd, dtype=np.float64)
+    liquidity_usd = np.asarray(liquidity_usd, dtype=np.float64)
+    has_liquidity = liquidity_usd > 0
+    size_ratio = np.divide(
+        size_usd,
+        liquidity_usd,
+        out=np.zeros(np.broadcast(size_usd, liquidity_usd).shape),
+        where=has_liquidity
+    )
+    
+    fill_rate = np.select(
+        [size_ratio < 0.05, size_ratio < 0.20],
+        [max_fill_rate, 1.0 - (size_ratio - 0.05) * 2],
+        default=0.7 * np.exp(-5 * (size_ratio - 0.20))
+    )
+    return np.where(has_liquidity, np.maximum(fill_rate, min_fill_rate), min_fill_rate)
+
 
 class TradeSimulator:
     """Simulate realistic trade execution"""
     
+    # Random draws generated per refill of the execution delay buffers
+    DELAY_DRAW_BLOCK = 1024
+    
     def __init__(self, config: Optional[Dict] = None):
         self.config = {
             'base_slippage': 0.02,      # 2% base slippage
@@ -24,6 +83,11 @@ class TradeSimulator:
         if config:
             self.config.update(config)
             
+        self._rng = np.random.default_rng()
+        self._delay_normals: List[float] = []
+        self._delay_blocks: List[int] = []
+        self._delay_idx = 0
+            
     def simulate_entry(
         self,
         signal_price: float,
@@ -73,12 +137,7 @@ class TradeSimulator:
         """Simulate trade exit with realistic conditions"""
         
         # Adjust slippage based on urgency
-        urgency_multipliers = {
-            'patient': 0.5,
-            'normal': 1.0,
-            'urgent': 1.5
-        }
-        urgency_mult = urgency_multipliers.get(urgency, 1.0)
+        urgency_mult = URGENCY_MULTIPLIERS.get(urgency, 1.0)
         
         # Calculate impacts
         size_impact = self._calculate_size_impact(size_usd, liquidity_usd)
@@ -107,6 +166,73 @@ class TradeSimulator:
             'execution_delay_ms': self._simulate_execution_delay()
         }
         
+    def simulate_entries(
+        self,
+        signal_price: np.ndarray,
+        size_usd: np.ndarray,
+        liquidity_usd: np.ndarray,
+        volatility: np.ndarray = 0.02
+    ) -> Dict[str, np.ndarray]:
+        """simulate_entry for arrays of trades, returning one array per result field"""
+        
+        # Broadcast every input to one shape so all result fields line up, scalars included
+        signal_price, size_usd, liquidity_usd, volatility = np.broadcast_arrays(
+            *(np.asarray(x, dtype=np.float64) for x in (signal_price, size_usd, liquidity_usd, volatility))
+        )
+        
+        size_impact = _size_impacts(size_usd, liquidity_usd)
+        vol_impact = volatility * self.config['volatility_multiplier']
+        total_slippage = self.config['base_slippage'] + size_impact + vol_impact
+        
+        fill_rate = _fill_rates(size_usd, liquidity_usd, self.config['min_fill_rate'], self.config['max_fill_rate'])
+        
+        return {
+            'executed_price': signal_price * (1 + total_slippage),
+            'executed_size': size_usd * fill_rate,
+            'fill_rate': fill_rate,
+            'total_slippage': total_slippage,
+            'size_impact': size_impact,
+            'volatility_impact': vol_impact,
+            'execution_delay_ms': self._simulate_execution_delays(size_impact.shape)
+        }
+        
+    def simulate_exits(
+        self,
+        current_price: np.ndarray,
+        size_usd: np.ndarray,
+        liquidity_usd: np.ndarray,
+        volatility: np.ndarray = 0.02,
+        urgency: Union[str, List[str]] = 'normal'
+    ) -> Dict[str, np.ndarray]:
+        """simulate_exit for arrays of trades, with one urgency for all or one per trade"""
+        
+        if isinstance(urgency, str):
+            urgency_mult = URGENCY_MULTIPLIERS.get(urgency, 1.0)
+        else:
+            urgency_mult = [URGENCY_MULTIPLIERS.get(u, 1.0) for u in urgency]
+            
+        # Broadcast every input to one shape so all result fields line up, scalars included
+        current_price, size_usd, liquidity_usd, volatility, urgency_mult = np.broadcast_arrays(
+            *(np.asarray(x, dtype=np.float64) for x in (current_price, size_usd, liquidity_usd, volatility, urgency_mult))
+        )
+        
+        size_impact = _size_impacts(size_usd, liquidity_usd)
+        vol_impact = volatility * self.config['volatility_multiplier']
+        total_slippage = (self.config['base_slippage'] * 1.5 + size_impact + vol_impact) * urgency_mult
+        
+        fill_rate = _fill_rates(size_usd, liquidity_usd, self.config['min_fill_rate'], self.config['max_fill_rate']) * 0.9
+        
+        return {
+            'executed_price': current_price * (1 - total_slippage),
+            'executed_size': size_usd * fill_rate,
+            'fill_rate': fill_rate,
+            'total_slippage': total_slippage,
+            'size_impact': size_impact,
+            'volatility_impact': vol_impact,
+            'urgency': urgency,
+            'execution_delay_ms': self._simulate_execution_delays(size_impact.shape)
+        }
+        
     def _calculate_size_impact(
         self,
         size_usd: float,
@@ -159,18 +285,37 @@ class TradeSimulator:
     def _simulate_execution_delay(self) -> int:
         """Simulate network and execution delays"""
         
+        if self._delay_idx == len(self._delay_normals):
+            self._refill_delay_draws()
+            
+        z = self._delay_normals[self._delay_idx]
+        blocks_to_include = self._delay_blocks[self._delay_idx]
+        self._delay_idx += 1
+        
         # Network delay (normally distributed)
-        network_delay = max(0, np.random.normal(
-            self.config['network_delay_ms'],
-            self.config['network_delay_ms'] * 0.2
-        ))
+        network_delay = max(0, self.config['network_delay_ms'] * (1 + 0.2 * z))
         
         # Block inclusion delay (0-2 blocks typically)
-        blocks_to_include = np.random.poisson(0.5)
         block_delay = blocks_to_include * self.config['block_time_ms']
         
         return int(network_delay + block_delay)
         
+    def _simulate_execution_delays(self, shape: Tuple[int, ...]) -> np.ndarray:
+        """_simulate_execution_delay for an array of trades of the given shape"""
+        
+        network_delay = self.config['network_delay_ms'] * (1 + 0.2 * self._rng.standard_normal(shape))
+        block_delay = self._rng.poisson(0.5, shape) * self.config['block_time_ms']
+        
+        return (np.maximum(network_delay, 0) + block_delay).astype(np.int64)
+        
+    def _refill_delay_draws(self):
+        """Draw the next block of standard normals and block counts for execution delays"""
+        
+        # Standard normals are scaled on use so config changes still apply
+        self._delay_normals = self._rng.standard_normal(self.DELAY_DRAW_BLOCK).tolist()
+        self._delay_blocks = self._rng.poisson(0.5, self.DELAY_DRAW_BLOCK).tolist()
+        self._delay_idx = 0
+        
     def simulate_partial_fills(
         self,
         total_size: float,
@@ -185,26 +330,23 @@ class TradeSimulator:
                 'fill_percent': 100.0
             }]
             
-        # Generate random fill percentages
-        fill_percentages = np.random.dirichlet(np.ones(num_fills)) * 100
-        
-        fills = []
-        remaining_size = total_size
-        
-        for i, pct in enumerate(fill_percentages):
-            fill_size = total_size * (pct / 100)
-            
-            # Ensure we don't exceed remaining size
-            fill_size = min(fill_size, remaining_size)
-            remaining_size -= fill_size
-            
-            fills.append({
-                'size': fill_size,
+        # Random fill fractions: normalised exponentials are a flat Dirichlet draw
+        fractions = self._rng.standard_exponential(num_fills)
+        fractions /= fractions.sum()
+        
+        # Cap each fill at what the earlier fills left over
+        sizes = total_size * fractions
+        remaining = total_size - np.concatenate(([0.0], np.cumsum(sizes)[:-1]))
+        sizes = np.minimum(sizes, remaining)
+        
+        return [
+            {
+                'size': size,
                 'fill_percent': pct,
                 'order': i + 1
-            })
-            
-        return fills
+            }
+            for i, (size, pct) in enumerate(zip(sizes.tolist(), (fractions * 100).tolist()))
+        ]
         
     def estimate_trading_costs(
         self,
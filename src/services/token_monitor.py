@@ -1,4 +1,5 @@
 import asyncio
+import random
 from datetime import datetime, timezone, timedelta
 from typing import List, Dict, Set, Optional, Callable
 import logging
@@ -19,7 +20,9 @@ class TokenMonitor:
         birdeye_client: BirdeyeClient,
         token_tracker: TokenAgeTracker,
         db_pool: asyncpg.Pool,
-        redis_client: aioredis.Redis
+        redis_client: aioredis.Redis,
+        poll_interval: float = 60,
+        max_poll_interval: float = 600
     ):
         self.birdeye = birdeye_client
         self.tracker = token_tracker
@@ -29,7 +32,8 @@ class TokenMonitor:
         self.monitored_tokens: Set[str] = set()
         self.callbacks: List[Callable] = []
         self.running = False
-        self.poll_interval = 60  # seconds
+        self.poll_interval = poll_interval  # seconds, while new tokens keep arriving
+        self.max_poll_interval = max_poll_interval  # seconds, cap for idle slow-down and error backoff
         
     def register_callback(self, callback: Callable):
         """Register a callback for new token notifications"""
@@ -43,13 +47,28 @@ class TokenMonitor:
         # Load existing monitored tokens
         await self._load_monitored_tokens()
         
+        interval = self.poll_interval
+        errors = 0
+        
         while self.running:
             try:
-                await self._check_new_tokens()
-                await asyncio.sleep(self.poll_interval)
+                added = await self._check_new_tokens()
+                errors = 0
+                
+                # Poll at the base rate while tokens arrive, slowing down while idle
+                if added:
+                    interval = self.poll_interval
+                else:
+                    interval = min(self.max_poll_interval, interval * 1.5)
+                delay = interval
             except Exception as e:
                 logger.error(f"Error in token monitor: {e}")
-                await asyncio.sleep(self.poll_interval)
+                errors += 1
+                
+                # Exponential backoff, jittered so restarted monitors don't poll in lockstep
+                delay = min(self.max_poll_interval, self.poll_interval * 2 ** errors) + random.uniform(0, 1)
+                
+            await asyncio.sleep(delay)
                 
     async def stop(self):
         """Stop monitoring"""
@@ -72,28 +91,31 @@ class TokenMonitor:
         self.monitored_tokens = {row['token_address'] for row in rows}
         logger.info(f"Loaded {len(self.monitored_tokens)} monitored tokens")
         
-    async def _check_new_tokens(self):
-        """Check for new tokens"""
-        
-        try:
-            # Get latest tokens from Birdeye
-            new_tokens = await self.birdeye.get_token_list(
-                sort_by="createdAt",
-                sort_type="desc",
-                limit=50
-            )
+    async def _check_new_tokens(self) -> int:
+        """Check for new tokens, returning how many started being monitored"""
+        
+        # Get latest tokens from Birdeye
+        new_tokens = await self.birdeye.get_token_list(
+            sort_by="createdAt",
+            sort_type="desc",
+            limit=50
+        )
+        
+        accepted = []
+        for token in new_tokens:
+            address = token.get('address')
+            if not address or address in self.monitored_tokens:
+                continue
+                
+            # Check if token meets criteria
+            if await self._should_monitor_token(token):
+                self.monitored_tokens.add(address)
+                accepted.append(token)
+                
+        if accepted:
+            await self._process_new_tokens(accepted)
             
-            for token in new_tokens:
-                address = token.get('address')
-                if not address or address in self.monitored_tokens:
-                    continue
-                    
-                # Check if token meets criteria
-                if await self._should_monitor_token(token):
-                    await self._process_new_token(token)
-                    
-        except Exception as e:
-            logger.error(f"Error checking new tokens: {e}")
+        return len(accepted)
             
     async def _should_monitor_token(self, token: Dict) -> bool:
         """Determine if token should be monitored"""
@@ -120,47 +142,49 @@ class TokenMonitor:
             
         return True
         
-    async def _process_new_token(self, token: Dict):
-        """Process a newly discovered token"""
-        
-        address = token['address']
-        self.monitored_tokens.add(address)
+    async def _process_new_tokens(self, tokens: List[Dict]):
+        """Store newly discovered tokens in one batch, then notify callbacks"""
         
         # Get full token metadata
-        creation_time = await self.tracker.get_token_creation_time(address)
+        creation_times = await self.tracker.get_token_creation_times([t['address'] for t in tokens])
         
         # Store in database
+        now = datetime.now(timezone.utc)
         async with self.db.acquire() as conn:
-            await conn.execute("""
+            await conn.executemany("""
                 INSERT INTO token_metadata (
                     token_address, name, symbol, decimals,
                     created_at, updated_at
                 )
                 VALUES ($1, $2, $3, $4, $5, NOW())
                 ON CONFLICT (token_address) DO NOTHING
-            """,
-                address,
-                token.get('name'),
-                token.get('symbol'),
-                token.get('decimals', 9),
-                creation_time or datetime.now(timezone.utc)
-            )
+            """, [
+                (
+                    token['address'],
+                    token.get('name'),
+                    token.get('symbol'),
+                    token.get('decimals', 9),
+                    creation_times.get(token['address']) or now
+                )
+                for token in tokens
+            ])
             
         # Notify callbacks
-        for callback in self.callbacks:
-            try:
-                await callback({
-                    'token_address': address,
-                    'name': token.get('name'),
-                    'symbol': token.get('symbol'),
-                    'liquidity': token.get('liquidity', {}).get('usd', 0),
-                    'volume_24h': token.get('v24hUSD', 0),
-                    'created_at': creation_time,
-                    'discovered_at': datetime.now(timezone.utc)
-                })
-            except Exception as e:
-                logger.error(f"Error in callback: {e}")
-                
+        for token in tokens:
+            for callback in self.callbacks:
+                try:
+                    await callback({
+                        'token_address': token['address'],
+                        'name': token.get('name'),
+                        'symbol': token.get('symbol'),
+                        'liquidity': token.get('liquidity', {}).get('usd', 0),
+                        'volume_24h': token.get('v24hUSD', 0),
+                        'created_at': creation_times.get(token['address']),
+                        'discovered_at': datetime.now(timezone.utc)
+                    })
+                except Exception as e:
+                    logger.error(f"Error in callback: {e}")
+                    
     async def get_monitored_tokens(
         self,
         max_age_hours: Optional[float] = None
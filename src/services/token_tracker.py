@@ -25,6 +25,7 @@ class TokenAgeTracker:
         self.db = db_pool
         self.redis = redis_client
         self.cache_ttl = 86400  # 24 hours
+        self.max_concurrent_fetches = 16  # Cold-cache API lookups in flight at once
         
     async def get_token_creation_time(self, token_address: str) -> Optional[datetime]:
         """Get token creation time from first mint transaction"""
@@ -53,6 +54,70 @@ class TokenAgeTracker:
             return creation_time
             
         # Try to fetch from APIs
+        return await self._fetch_and_store_creation_time(token_address)
+        
+    async def get_token_creation_times(
+        self,
+        token_addresses: List[str]
+    ) -> Dict[str, Optional[datetime]]:
+        """Get creation times for many tokens with one cache and one DB round trip"""
+        
+        if not token_addresses:
+            return {}
+            
+        # Check cache first
+        cached = await self.redis.mget(*(f"token_creation:{a}" for a in token_addresses))
+        creation_times = {
+            address: datetime.fromisoformat(value)
+            for address, value in zip(token_addresses, cached)
+            if value
+        }
+        
+        # Check database for the rest
+        missing = [a for a in token_addresses if a not in creation_times]
+        if missing:
+            creation_times.update(await self._bulk_lookup(missing))
+            
+        # Try to fetch the remainder from APIs
+        missing = [a for a in missing if a not in creation_times]
+        if missing:
+            results = await self._fetch_and_store_many(missing)
+            creation_times.update(zip(missing, results))
+            
+        return {address: creation_times.get(address) for address in token_addresses}
+        
+    async def _bulk_lookup(self, token_addresses: List[str]) -> Dict[str, datetime]:
+        """Fetch stored creation times for many tokens in one query and cache them"""
+        
+        async with self.db.acquire() as conn:
+            rows = await conn.fetch(
+                "SELECT token_address, created_at FROM token_metadata "
+                "WHERE token_address = ANY($1::text[])",
+                token_addresses
+            )
+            
+        creation_times = {
+            row['token_address']: row['created_at']
+            for row in rows
+            if row['created_at']
+        }
+        
+        # Update cache
+        if creation_times:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for address, creation_time in creation_times.items():
+                    pipe.setex(
+                        f"token_creation:{address}",
+                        self.cache_ttl,
+                        creation_time.isoformat()
+                    )
+                await pipe.execute()
+                
+        return creation_times
+        
+    async def _fetch_and_store_creation_time(self, token_address: str) -> Optional[datetime]:
+        """Fetch creation time from APIs, then persist and cache it"""
+        
         creation_time = await self._fetch_creation_time(token_address)
         
         if creation_time:
@@ -61,32 +126,66 @@ class TokenAgeTracker:
             
             # Cache result
             await self.redis.setex(
-                cache_key,
+                f"token_creation:{token_address}",
                 self.cache_ttl,
                 creation_time.isoformat()
             )
             
         return creation_time
         
+    async def _fetch_and_store_many(
+        self,
+        token_addresses: List[str],
+        return_exceptions: bool = False
+    ) -> List[Any]:
+        """_fetch_and_store_creation_time for many tokens, with at most max_concurrent_fetches in flight"""
+        
+        semaphore = asyncio.Semaphore(self.max_concurrent_fetches)
+        
+        async def fetch(address: str) -> Optional[datetime]:
+            async with semaphore:
+                return await self._fetch_and_store_creation_time(address)
+                
+        return await asyncio.gather(*(fetch(a) for a in token_addresses), return_exceptions=return_exceptions)
+        
     async def _fetch_creation_time(self, token_address: str) -> Optional[datetime]:
-        """Fetch token creation time from APIs"""
+        """Fetch token creation time from APIs, taking the first source to answer"""
+        
+        # Query Birdeye and Helius together instead of falling back in turn
+        tasks = [
+            asyncio.create_task(self._fetch_birdeye_creation_time(token_address)),
+            asyncio.create_task(self._fetch_helius_creation_time(token_address))
+        ]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                creation_time = await next_result
+                if creation_time:
+                    return creation_time
+            return None
+        finally:
+            for task in tasks:
+                task.cancel()
+                
+    async def _fetch_birdeye_creation_time(self, token_address: str) -> Optional[datetime]:
+        """Fetch token creation time from Birdeye"""
         
-        # Try Birdeye first (usually faster)
         try:
             creation_info = await self.birdeye.get_token_creation_info(token_address)
             if creation_info and 'createdAt' in creation_info:
                 return datetime.fromtimestamp(creation_info['createdAt'], tz=timezone.utc)
         except Exception as e:
             logger.error(f"Error fetching from Birdeye: {e}")
-            
-        # Fallback to Helius
+        return None
+        
+    async def _fetch_helius_creation_time(self, token_address: str) -> Optional[datetime]:
+        """Fetch token creation time from Helius"""
+        
         try:
             creation_time = await self.helius.get_token_creation_time(token_address)
             if creation_time:
                 return creation_time.replace(tzinfo=timezone.utc)
         except Exception as e:
             logger.error(f"Error fetching from Helius: {e}")
-            
         return None
         
     async def _store_token_metadata(
@@ -141,26 +240,26 @@ class TokenAgeTracker:
     async def batch_update_token_metadata(self, token_addresses: List[str]):
         """Batch update token metadata for efficiency"""
         
+        if not token_addresses:
+            return
+            
         # Filter out already cached tokens
-        uncached_tokens = []
-        for address in token_addresses:
-            cache_key = f"token_creation:{address}"
-            if not await self.redis.exists(cache_key):
-                uncached_tokens.append(address)
-                
+        cached = await self.redis.mget(*(f"token_creation:{a}" for a in token_addresses))
+        uncached_tokens = [address for address, value in zip(token_addresses, cached) if value is None]
+        
         if not uncached_tokens:
             return
             
-        logger.info(f"Batch updating metadata for {len(uncached_tokens)} tokens")
+        # Stored tokens only need caching, which _bulk_lookup does in one pipeline
+        stored = await self._bulk_lookup(uncached_tokens)
+        uncached_tokens = [address for address in uncached_tokens if address not in stored]
         
-        # Create tasks for parallel fetching
-        tasks = []
-        for address in uncached_tokens:
-            task = self.get_token_creation_time(address)
-            tasks.append(task)
+        if not uncached_tokens:
+            return
             
-        # Execute with rate limiting
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        logger.info(f"Batch updating metadata for {len(uncached_tokens)} tokens")
+        
+        results = await self._fetch_and_store_many(uncached_tokens, return_exceptions=True)
         
         # Log errors
         for address, result in zip(uncached_tokens, results):
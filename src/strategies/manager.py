@@ -1,10 +1,12 @@
 """Strategy management and CRUD operations"""
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 import asyncpg
+import copy
 import json
 import logging
+import time
 
 from .templates import STRATEGY_TEMPLATES, get_template
 
@@ -14,8 +16,12 @@ logger = logging.getLogger(__name__)
 class StrategyManager:
     """Manage strategy configurations in database"""
     
+    # Seconds a strategy looked up by ID is served from memory
+    STRATEGY_CACHE_TTL = 60
+    
     def __init__(self, db_pool: asyncpg.Pool):
         self.db = db_pool
+        self._strategy_cache: Dict[int, Tuple[float, Dict]] = {}
         
     async def create_strategy(
         self,
@@ -35,7 +41,7 @@ class StrategyManager:
                     INSERT INTO strategy_configs (name, description, conditions, is_active)
                     VALUES ($1, $2, $3, $4)
                     RETURNING id
-                """, name, description, json.dumps(conditions), is_active)
+                """, name, description, conditions, is_active)
                 
                 logger.info(f"Created strategy '{name}' with ID {strategy_id}")
                 return strategy_id
@@ -74,6 +80,11 @@ class StrategyManager:
     async def get_strategy(self, strategy_id: int) -> Optional[Dict]:
         """Get strategy by ID"""
         
+        # Callers get their own copy so they cannot alter the cached strategy
+        cached = self._strategy_cache.get(strategy_id)
+        if cached and time.monotonic() - cached[0] < self.STRATEGY_CACHE_TTL:
+            return copy.deepcopy(cached[1])
+            
         async with self.db.acquire() as conn:
             row = await conn.fetchrow("""
                 SELECT * FROM strategy_configs
@@ -81,7 +92,7 @@ class StrategyManager:
             """, strategy_id)
             
         if row:
-            return {
+            strategy = {
                 'id': row['id'],
                 'name': row['name'],
                 'description': row['description'],
@@ -90,6 +101,8 @@ class StrategyManager:
                 'created_at': row['created_at'],
                 'updated_at': row['updated_at']
             }
+            self._strategy_cache[strategy_id] = (time.monotonic(), strategy)
+            return copy.deepcopy(strategy)
             
         return None
         
@@ -174,7 +187,7 @@ class StrategyManager:
             self._validate_conditions(conditions)
             param_count += 1
             updates.append(f"conditions = ${param_count}")
-            values.append(json.dumps(conditions))
+            values.append(conditions)
             
         if is_active is not None:
             param_count += 1
@@ -195,6 +208,7 @@ class StrategyManager:
         async with self.db.acquire() as conn:
             result = await conn.execute(query, *values)
             
+        self._strategy_cache.pop(strategy_id, None)
         return result.split()[-1] != '0'
         
     async def delete_strategy(self, strategy_id: int) -> bool:
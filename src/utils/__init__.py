@@ -12,7 +12,9 @@ from .performance import (
     calculate_trade_metrics,
     fast_rolling_sum,
     fast_rolling_mean,
-    fast_rolling_std
+    fast_rolling_std,
+    max_streaks,
+    equity_curve_stats
 )
 
 __all__ = [
@@ -31,5 +33,7 @@ __all__ = [
     "calculate_trade_metrics",
     "fast_rolling_sum",
     "fast_rolling_mean",
-    "fast_rolling_std"
+    "fast_rolling_std",
+    "max_streaks",
+    "equity_curve_stats"
 ]
\ No newline at end of file
@@ -3,11 +3,35 @@
 import asyncio
 import asyncpg
 import logging
+import orjson
 from config import get_database_url
 
 logger = logging.getLogger(__name__)
 
 
+def _encode_jsonb(value) -> bytes:
+    """Binary JSONB: a version byte (1) followed by the JSON text"""
+    # Metrics carry NumPy scalars and Decimals from NUMERIC columns
+    return b'\x01' + orjson.dumps(value, default=float, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def _decode_jsonb(data: bytes):
+    return orjson.loads(data[1:])
+
+
+async def init_connection(conn: asyncpg.Connection):
+    """Per-connection setup for pools: encode/decode JSONB natively with orjson"""
+    
+    # Binary format keeps the codec usable from COPY (copy_records_to_table)
+    await conn.set_type_codec(
+        'jsonb',
+        encoder=_encode_jsonb,
+        decoder=_decode_jsonb,
+        schema='pg_catalog',
+        format='binary'
+    )
+
+
 async def ensure_database_exists():
     """Ensure database and tables exist"""
     
@@ -1,6 +1,7 @@
 """Performance optimized calculations using NumPy"""
 
 import numpy as np
+from numba import njit
 from typing import List, Dict, Tuple, Optional
 import logging
 
@@ -84,9 +85,12 @@ def calculate_max_drawdown(equity_curve: np.ndarray) -> Tuple[float, int, int]:
     max_dd_idx = np.argmin(drawdowns)
     max_dd = drawdowns[max_dd_idx]
     
-    # Find start of drawdown (last peak before max drawdown)
-    start_idx = np.where(equity_curve[:max_dd_idx] == running_max[:max_dd_idx])[0]
-    start_idx = start_idx[-1] if len(start_idx) > 0 else 0
+    # Find start of drawdown: the last time the curve stood at the peak it fell from
+    if max_dd_idx > 0:
+        before = equity_curve[max_dd_idx - 1::-1]
+        start_idx = max_dd_idx - 1 - np.argmax(before == running_max[max_dd_idx])
+    else:
+        start_idx = 0
     
     return abs(max_dd), start_idx, max_dd_idx
 
@@ -188,6 +192,60 @@ def fast_rolling_std(
     return np.sqrt(rolling_var)
 
 
+@njit(cache=True)
+def max_streaks(pnl: np.ndarray) -> Tuple[int, int]:
+    """Longest winning and losing streaks (a non-positive P&L counts as a loss)"""
+    
+    max_wins = max_losses = 0
+    current_wins = current_losses = 0
+    
+    for p in pnl:
+        if p > 0:
+            current_wins += 1
+            current_losses = 0
+            if current_wins > max_wins:
+                max_wins = current_wins
+        else:
+            current_losses += 1
+            current_wins = 0
+            if current_losses > max_losses:
+                max_losses = current_losses
+                
+    return max_wins, max_losses
+
+
+@njit(cache=True)
+def equity_curve_stats(
+    pnl_usd: np.ndarray,
+    initial_capital: float
+) -> Tuple[float, float, float, float]:
+    """
+    Walk the equity curve built from per-trade USD P&L in a single pass
+    
+    Returns:
+        (final_equity, max_equity, min_equity, max_drawdown), including the
+        initial capital; max_drawdown is a fraction of the running peak
+    """
+    
+    equity = initial_capital
+    max_equity = initial_capital
+    min_equity = initial_capital
+    max_drawdown = 0.0
+    
+    for p in pnl_usd:
+        equity += p
+        if equity > max_equity:
+            max_equity = equity
+        elif equity < min_equity:
+            min_equity = equity
+        if max_equity > 0:
+            drawdown = (max_equity - equity) / max_equity
+            if drawdown > max_drawdown:
+                max_drawdown = drawdown
+                
+    return equity, max_equity, min_equity, max_drawdown
+
+
 def calculate_trade_metrics(trades: List[Dict]) -> Dict:
     """Calculate comprehensive trade metrics"""
     
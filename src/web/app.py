@@ -15,6 +15,7 @@ from datetime import datetime
 
 from config import settings, get_database_url, get_redis_url
 from config.logging import setup_logging
+from src.utils.db_init import init_connection
 from src.api import HeliusClient, BirdeyeClient, APICache
 from src.services import TokenAgeTracker, TokenMonitor
 from src.strategies import StrategyManager
@@ -56,7 +57,8 @@ async def lifespan(app: FastAPI):
                     get_database_url(),
                     min_size=10,
                     max_size=20,
-                    command_timeout=60
+                    command_timeout=60,
+                    init=init_connection
                 )
                 break
             except Exception as db_error:
@@ -65,13 +67,30 @@ async def lifespan(app: FastAPI):
                     raise
                 await asyncio.sleep(2)
         
-        # Initialize Redis
+        # Initialize Redis (aioredis picks the hiredis parser when it is installed)
         logger.info("Connecting to Redis")
-        dependencies.redis_client = await aioredis.from_url(
+        # Blocking pool so callers wait for a free connection instead of failing at the cap
+        redis_pool = aioredis.BlockingConnectionPool.from_url(
             get_redis_url(),
             encoding="utf-8",
-            decode_responses=True
+            decode_responses=True,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            timeout=settings.REDIS_POOL_TIMEOUT
         )
+        dependencies.redis_client = aioredis.Redis(connection_pool=redis_pool)
+        
+        # Small pool with tight timeouts for job update publishes, which are best-effort;
+        # concurrent publishes queue briefly for a connection rather than being dropped
+        publisher_pool = aioredis.BlockingConnectionPool.from_url(
+            get_redis_url(),
+            encoding="utf-8",
+            decode_responses=True,
+            max_connections=2,
+            timeout=0.25,
+            socket_timeout=0.05,
+            socket_connect_timeout=0.05
+        )
+        dependencies.redis_publisher = aioredis.Redis(connection_pool=publisher_pool)
         
         # Initialize API clients
         logger.info("Initializing API clients")
@@ -104,14 +123,16 @@ async def lifespan(app: FastAPI):
             dependencies.helius_client,
             dependencies.birdeye_client,
             dependencies.db_pool,
-            dependencies.redis_client
+            dependencies.redis_client,
+            strategy_manager=dependencies.strategy_manager
         )
         
         # Initialize job manager
         from src.engine.job_manager import JobManager
         dependencies.job_manager = JobManager(
             dependencies.redis_client,
-            dependencies.db_pool
+            dependencies.db_pool,
+            publisher=dependencies.redis_publisher
         )
         
         # Start token monitor (optional - don't fail startup)
@@ -148,6 +169,9 @@ async def lifespan(app: FastAPI):
         if dependencies.redis_client:
             await dependencies.redis_client.close()
             
+        if dependencies.redis_publisher:
+            await dependencies.redis_publisher.close()
+            
     except Exception as e:
         logger.error(f"Cleanup error: {e}")
 
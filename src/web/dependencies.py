@@ -7,6 +7,7 @@ import aioredis
 # Global connections (will be initialized by app lifespan)
 db_pool: Optional[asyncpg.Pool] = None
 redis_client: Optional[aioredis.Redis] = None
+redis_publisher: Optional[aioredis.Redis] = None
 helius_client = None
 birdeye_client = None
 token_tracker = None
@@ -68,6 +69,10 @@ def get_redis_client():
     """Get Redis client (sync wrapper)"""
     return redis_client
 
+def get_redis_publisher():
+    """Get best-effort Redis publisher (sync wrapper)"""
+    return redis_publisher
+
 def get_helius_client():
     """Get Helius client (sync wrapper)"""
     return helius_client
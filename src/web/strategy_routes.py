@@ -3,7 +3,7 @@
 from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends, Query
 from pydantic import BaseModel, Field, validator
 from typing import Dict, List, Optional, Any
-from datetime import datetime
+from datetime import datetime, timezone
 import asyncio
 import uuid
 import logging
@@ -11,7 +11,9 @@ import logging
 from src.strategies import StrategyManager, STRATEGY_TEMPLATES, get_template
 from src.engine import BacktestEngine
 from src.engine.job_manager import BacktestJobManager, BacktestJobExecutor, JobStatus
-from .dependencies import get_strategy_manager, get_backtest_engine, get_db, get_redis_client
+from .dependencies import (
+    get_strategy_manager, get_backtest_engine, get_db, get_redis_client, get_redis_publisher
+)
 
 logger = logging.getLogger(__name__)
 
@@ -310,7 +312,8 @@ async def validate_strategy(
 async def run_strategy_backtest(
     request: BacktestRequest,
     manager: StrategyManager = Depends(get_strategy_manager),
-    redis_client = Depends(get_redis_client)
+    redis_client = Depends(get_redis_client),
+    redis_publisher = Depends(get_redis_publisher)
 ):
     """Run backtest with specific strategy using job queue"""
     
@@ -324,7 +327,7 @@ async def run_strategy_backtest(
         raise HTTPException(400, detail="At least one token address is required")
         
     # Create job manager
-    job_manager = BacktestJobManager(redis_client)
+    job_manager = BacktestJobManager(redis_client, publisher=redis_publisher)
     
     # Create job with parameters
     job_params = {
@@ -453,6 +456,27 @@ async def get_strategy_performance(
     return performance
 
 
+def _iso_time(timestamp: float) -> str:
+    """Format a stored epoch timestamp for API responses"""
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+def _format_job(job: Dict) -> Dict:
+    """Render a stored job's epoch timestamps as ISO strings"""
+    
+    formatted = {
+        **job,
+        'created_at': _iso_time(job['created_at']),
+        'updated_at': _iso_time(job['updated_at'])
+    }
+    if 'logs' in job:
+        formatted['logs'] = [
+            {**entry, 'timestamp': _iso_time(entry['timestamp'])}
+            for entry in job['logs']
+        ]
+    return formatted
+
+
 @router.get("/jobs/{job_id}")
 async def get_job_status(
     job_id: str,
@@ -461,11 +485,13 @@ async def get_job_status(
     """Get job status and progress"""
     
     job_manager = BacktestJobManager(redis_client)
-    job = await job_manager.get_job(job_id)
+    job = await job_manager.get_job(job_id, include_logs=True)
     
     if not job:
         raise HTTPException(404, detail="Job not found")
         
+    job = _format_job(job)
+    
     return {
         "job_id": job_id,
         "status": job['status'],
@@ -490,7 +516,7 @@ async def list_jobs(
     jobs = await job_manager.list_jobs(status=status, limit=limit)
     
     return {
-        "jobs": jobs,
+        "jobs": [_format_job(job) for job in jobs],
         "count": len(jobs),
         "filter": {"status": status} if status else None
     }
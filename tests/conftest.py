@@ -12,6 +12,7 @@ from src.api import HeliusClient, BirdeyeClient, APICache
 from src.services import TokenAgeTracker
 from src.strategies import StrategyManager
 from src.engine import BacktestEngine
+from src.utils.db_init import init_connection
 
 
 # Test database URL (use separate test database)
@@ -32,7 +33,8 @@ async def db_pool():
     pool = await asyncpg.create_pool(
         TEST_DATABASE_URL,
         min_size=2,
-        max_size=5
+        max_size=5,
+        init=init_connection
     )
     
     # Create test schema
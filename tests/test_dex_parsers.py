@@ -194,9 +194,10 @@ class TestDEXParsers:
         transfers = parser.extract_token_transfers(tx)
         
         assert len(transfers) == 2
-        assert transfers[0]['amount'] == '1000000000'
+        assert transfers[0]['amount'] == 1000000000
+        assert transfers[0]['decimals'] == 9
         assert transfers[0]['source'] == 'source_account'
-        assert transfers[1]['amount'] == '500000000'
+        assert transfers[1]['amount'] == 500000000
         assert transfers[1]['decimals'] == 6
         assert transfers[1]['mint'] == 'token_mint'
         
@@ -235,14 +236,15 @@ class TestDEXParsers:
         transfers = [
             {
                 'mint': 'So11111111111111111111111111111111111111112',  # SOL
-                'amount': '1000000000',  # 1 SOL
+                'amount': 1000000000,  # 1 SOL
+                'decimals': 9,
                 'source': 'user_wallet',
                 'destination': 'pool_account'
             },
             {
                 'mint': 'token_mint_address',
-                'amount': '5000000000',  # 5000 tokens (9 decimals)
-                'decimals': 9,
+                'amount': 5000000,  # 5000 tokens (3 decimals)
+                'decimals': 3,
                 'source': 'pool_account',
                 'destination': 'user_wallet'
             }
@@ -256,4 +258,30 @@ class TestDEXParsers:
         
         assert result['sol_amount'] == pytest.approx(1.0, rel=0.01)
         assert result['token_amount'] == pytest.approx(5000.0, rel=0.01)
-        assert result['is_buy'] is True  # User sent SOL, received tokens
\ No newline at end of file
+        assert result['is_buy'] is True  # User sent SOL, received tokens
+        
+    def test_discriminator_prefix_filter(self):
+        """Test non-swap instructions are rejected before decoding"""
+        
+        parser = RaydiumCLMMParser()
+        
+        # Prefix is stable regardless of the bytes after the discriminator
+        swap_data = b64encode(parser.SWAP_DISCRIMINATOR + b'\xff' * 33).decode('utf-8')
+        assert parser.has_swap_discriminator(swap_data) is True
+        
+        other_data = b64encode(b'\x00' * 41).decode('utf-8')
+        assert parser.has_swap_discriminator(other_data) is False
+        
+        tx = {
+            'signature': 'test_non_swap_sig',
+            'timestamp': 1234567890,
+            'instructions': [
+                {
+                    'programId': 'CAMMCzo5YL8w4VFF8KVHrK22GGUsp5VTaW7grrKgrWqK',
+                    'data': other_data,
+                    'accounts': []
+                }
+            ]
+        }
+        
+        assert parser.parse_swap(tx) is None
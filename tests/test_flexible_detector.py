@@ -3,6 +3,7 @@
 import pytest
 from datetime import datetime, timedelta, timezone
 
+from src.engine._kernels import transaction_arrays
 from src.engine.flexible_detector import FlexibleSignalDetector
 
 
@@ -83,14 +84,11 @@ class TestFlexibleSignalDetector:
             {"amount_usd": 2000},
             {"amount_usd": 2500}
         ]
-        assert detector._check_volume(transactions) is True
+        prefix = detector._window_prefix_sums(transaction_arrays(transactions))
+        assert detector._check_volume(detector._window_totals(prefix, 0, 3)) is True
         
         # Test with insufficient volume
-        transactions = [
-            {"amount_usd": 1000},
-            {"amount_usd": 1000}
-        ]
-        assert detector._check_volume(transactions) is False
+        assert detector._check_volume(detector._window_totals(prefix, 0, 2)) is False
         
     def test_large_buys_check(self):
         """Test large buy detection"""
@@ -116,7 +114,8 @@ class TestFlexibleSignalDetector:
             {"type": "buy", "amount_usd": 1200},
             {"type": "sell", "amount_usd": 1500}
         ]
-        assert detector._check_large_buys(transactions) is True
+        prefix = detector._window_prefix_sums(transaction_arrays(transactions))
+        assert detector._check_large_buys(detector._window_totals(prefix, 0, 4)) is True
         
         # Test with insufficient large buys
         transactions = [
@@ -124,7 +123,8 @@ class TestFlexibleSignalDetector:
             {"type": "buy", "amount_usd": 1500},
             {"type": "sell", "amount_usd": 2000}
         ]
-        assert detector._check_large_buys(transactions) is False
+        prefix = detector._window_prefix_sums(transaction_arrays(transactions))
+        assert detector._check_large_buys(detector._window_totals(prefix, 0, 3)) is False
         
     def test_calculate_metrics(self):
         """Test metrics calculation"""
@@ -239,4 +239,36 @@ class TestFlexibleSignalDetector:
         # Test default
         strategy = {"conditions": {}}
         detector = FlexibleSignalDetector(strategy, None)
-        assert detector._get_window_seconds() == 30
\ No newline at end of file
+        assert detector._get_window_seconds() == 30
+        
+    @pytest.mark.asyncio
+    async def test_signal_cooldown(self):
+        """Test timestamps right after a signal cannot signal again"""
+        
+        strategy = {
+            "name": "Test Strategy",
+            "conditions": {
+                "large_buys": {
+                    "enabled": True,
+                    "min_count": 2,
+                    "min_amount": 1000,
+                    "window_seconds": 30
+                }
+            }
+        }
+        
+        detector = FlexibleSignalDetector(strategy, None)
+        
+        base_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        transactions = [
+            {'timestamp': base_time + timedelta(seconds=i), 'type': 'buy', 'amount_usd': 1500}
+            for i in range(20)
+        ]
+        pool_states = {base_time: {'liquidity_usd': 50000}}
+        
+        signals = await detector.detect_signals(transactions, pool_states, "token123")
+        
+        # Every timestamp after the first qualifies, so signals are spaced by the cooldown
+        assert [s['timestamp'] for s in signals] == [
+            base_time + timedelta(seconds=i) for i in (1, 7, 13, 19)
+        ]
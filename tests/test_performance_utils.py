@@ -15,7 +15,9 @@ from src.utils.performance import (
     calculate_trade_metrics,
     fast_rolling_sum,
     fast_rolling_mean,
-    fast_rolling_std
+    fast_rolling_std,
+    max_streaks,
+    equity_curve_stats
 )
 
 
@@ -148,6 +150,24 @@ class TestPerformanceUtils:
         
         np.testing.assert_array_almost_equal(rolling_mean, expected)
         
+    def test_max_streaks(self):
+        """Test win/loss streak kernel"""
+        pnl = np.array([5.0, 2.0, -1.0, 0.0, -3.0, 4.0, 1.0, 2.0, -1.0])
+        
+        assert max_streaks(pnl) == (3, 3)
+        assert max_streaks(np.array([], dtype=np.float64)) == (0, 0)
+        
+    def test_equity_curve_stats(self):
+        """Test single-pass equity curve kernel"""
+        pnl_usd = np.array([100.0, -300.0, 50.0, 400.0])
+        
+        final, max_equity, min_equity, max_drawdown = equity_curve_stats(pnl_usd, 1000.0)
+        
+        assert final == pytest.approx(1250.0)
+        assert max_equity == pytest.approx(1250.0)
+        assert min_equity == pytest.approx(800.0)
+        assert max_drawdown == pytest.approx(300.0 / 1100.0)
+        
     def test_calculate_trade_metrics(self):
         """Test comprehensive trade metrics calculation"""
         trades = [
@@ -0,0 +1,59 @@
+"""Tests for fixed-threshold signal detector"""
+
+from datetime import timedelta
+
+from src.engine.detector import SignalDetector
+
+
+class TestSignalDetector:
+    """Test rolling window signal detection"""
+    
+    def test_signal_on_full_window(self, sample_transactions, sample_pool_states):
+        """Test signal fires once the window meets every threshold"""
+        
+        detector = SignalDetector(min_large_buys=4, min_volume=5000)
+        
+        signals = detector.detect_signals(sample_transactions, sample_pool_states, "token123")
+        
+        assert len(signals) == 1
+        signal = signals[0]
+        assert signal['timestamp'] == sample_transactions[-1]['timestamp']
+        assert signal['window_transactions'] == 5
+        assert signal['metrics']['total_volume'] == 8600
+        assert signal['metrics']['buy_count'] == 4
+        assert signal['metrics']['sell_count'] == 1
+        assert signal['metrics']['large_buy_count'] == 4
+        
+    def test_window_clears_after_signal(self, sample_transactions, sample_pool_states):
+        """Test transactions before a signal do not count towards the next one"""
+        
+        detector = SignalDetector(min_large_buys=3, min_volume=5000)
+        
+        # Shuffled input must be sorted before scanning
+        signals = detector.detect_signals(
+            list(reversed(sample_transactions)),
+            sample_pool_states,
+            "token123"
+        )
+        
+        assert len(signals) == 1
+        assert signals[0]['timestamp'] == sample_transactions[3]['timestamp']
+        assert signals[0]['window_transactions'] == 4
+        
+    def test_window_edges(self, sample_pool_states):
+        """Test a transaction exactly window_seconds old is still in the window"""
+        
+        base_time = min(sample_pool_states)
+        transactions = [
+            {'timestamp': base_time, 'type': 'buy', 'amount_usd': 3000},
+            {'timestamp': base_time + timedelta(seconds=30), 'type': 'buy', 'amount_usd': 3000},
+            {'timestamp': base_time + timedelta(seconds=61), 'type': 'buy', 'amount_usd': 3000}
+        ]
+        
+        detector = SignalDetector(window_seconds=30, min_large_buys=2, min_volume=5000)
+        
+        signals = detector.detect_signals(transactions, sample_pool_states, "token123")
+        
+        # The second buy sees the first at the cutoff, the third is alone after it
+        assert [s['timestamp'] for s in signals] == [transactions[1]['timestamp']]
+        assert signals[0]['window_transactions'] == 2
@@ -0,0 +1,118 @@
+"""Tests for the trade execution simulator"""
+
+import pytest
+import numpy as np
+
+from src.engine.simulator import TradeSimulator, _fill_rates, _size_impacts
+
+
+class TestTradeSimulator:
+    """Test batch simulation against the per-trade API"""
+    
+    @pytest.fixture
+    def trades(self):
+        """Random trades spanning every size-to-liquidity regime, plus an empty pool"""
+        rng = np.random.default_rng(7)
+        n = 200
+        liquidity = rng.uniform(0, 200000, n)
+        liquidity[0] = 0.0
+        return {
+            'price': rng.uniform(0.0001, 10, n),
+            'size_usd': liquidity * rng.uniform(0, 0.5, n) ** 2 + rng.uniform(1, 100, n),
+            'liquidity_usd': liquidity,
+            'volatility': rng.uniform(0, 0.1, n)
+        }
+        
+    def test_simulate_entries_matches_simulate_entry(self, trades):
+        """Test batch entries agree with simulate_entry trade by trade"""
+        
+        simulator = TradeSimulator()
+        batch = simulator.simulate_entries(
+            trades['price'],
+            trades['size_usd'],
+            trades['liquidity_usd'],
+            trades['volatility']
+        )
+        
+        assert batch['execution_delay_ms'].shape == trades['price'].shape
+        for i in range(len(trades['price'])):
+            single = simulator.simulate_entry(
+                trades['price'][i],
+                trades['size_usd'][i],
+                trades['liquidity_usd'][i],
+                trades['volatility'][i]
+            )
+            for field in ('executed_price', 'executed_size', 'fill_rate', 'total_slippage', 'size_impact', 'volatility_impact'):
+                assert batch[field][i] == pytest.approx(single[field], rel=1e-12)
+                
+    def test_simulate_exits_matches_simulate_exit(self, trades):
+        """Test batch exits agree with simulate_exit, including per-trade urgency"""
+        
+        simulator = TradeSimulator()
+        urgency = [('patient', 'normal', 'urgent')[i % 3] for i in range(len(trades['price']))]
+        batch = simulator.simulate_exits(
+            trades['price'],
+            trades['size_usd'],
+            trades['liquidity_usd'],
+            trades['volatility'],
+            urgency
+        )
+        
+        for i in range(len(trades['price'])):
+            single = simulator.simulate_exit(
+                trades['price'][i],
+                trades['size_usd'][i],
+                trades['liquidity_usd'][i],
+                trades['volatility'][i],
+                urgency[i]
+            )
+            for field in ('executed_price', 'executed_size', 'fill_rate', 'total_slippage', 'size_impact', 'volatility_impact'):
+                assert batch[field][i] == pytest.approx(single[field], rel=1e-12)
+                
+    def test_batch_accepts_scalars(self):
+        """Test all-scalar inputs give 0-d results equal to the per-trade API"""
+        
+        simulator = TradeSimulator()
+        
+        entry = simulator.simulate_entries(1.0, 100.0, 1e5)
+        assert entry['execution_delay_ms'].shape == ()
+        assert float(entry['executed_price']) == pytest.approx(simulator.simulate_entry(1.0, 100.0, 1e5)['executed_price'])
+        
+        exit_ = simulator.simulate_exits(1.0, 100.0, 1e5, urgency='urgent')
+        assert exit_['execution_delay_ms'].shape == ()
+        assert float(exit_['executed_price']) == pytest.approx(
+            simulator.simulate_exit(1.0, 100.0, 1e5, urgency='urgent')['executed_price']
+        )
+        
+    def test_vectorized_helpers_match_scalar_helpers(self, trades):
+        """Test _size_impacts and _fill_rates agree with the per-trade calculations"""
+        
+        simulator = TradeSimulator()
+        impacts = _size_impacts(trades['size_usd'], trades['liquidity_usd'])
+        fill_rates = _fill_rates(
+            trades['size_usd'],
+            trades['liquidity_usd'],
+            simulator.config['min_fill_rate'],
+            simulator.config['max_fill_rate']
+        )
+        
+        for i, (size, liquidity) in enumerate(zip(trades['size_usd'], trades['liquidity_usd'])):
+            assert impacts[i] == simulator._calculate_size_impact(size, liquidity)
+            assert fill_rates[i] == simulator._calculate_fill_rate(size, liquidity)
+                
+    def test_partial_fills_split_the_order(self):
+        """Test partial fills are ordered, non-negative and add up to the whole order"""
+        
+        simulator = TradeSimulator()
+        
+        assert simulator.simulate_partial_fills(1000.0, 50000.0) == [{'size': 1000.0, 'fill_percent': 100.0}]
+        
+        for num_fills in (2, 5, 50):
+            fills = simulator.simulate_partial_fills(1000.0, 50000.0, num_fills)
+            
+            assert [fill['order'] for fill in fills] == list(range(1, num_fills + 1))
+            assert all(fill['size'] >= 0 for fill in fills)
+            assert sum(fill['size'] for fill in fills) == pytest.approx(1000.0)
+            assert sum(fill['fill_percent'] for fill in fills) == pytest.approx(100.0)
+            for fill in fills:
+                assert fill['size'] == pytest.approx(fill['fill_percent'] * 10.0)
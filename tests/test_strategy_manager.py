@@ -2,6 +2,7 @@
 
 import pytest
 from src.strategies import StrategyManager, STRATEGY_TEMPLATES
+from src.engine.backtest import BacktestEngine
 
 
 class TestStrategyManager:
@@ -108,6 +109,44 @@ class TestStrategyManager:
         assert strategy['name'] == "Updated Strategy"
         assert 'market_cap' in strategy['conditions']
         
+    @pytest.mark.asyncio
+    async def test_update_visible_to_backtest_engine(
+        self,
+        strategy_manager,
+        sample_strategy,
+        mock_helius_client,
+        mock_birdeye_client,
+        db_pool,
+        redis_client
+    ):
+        """Test an update through the API manager reaches the engine's cached strategy"""
+        
+        engine = BacktestEngine(
+            mock_helius_client,
+            mock_birdeye_client,
+            db_pool,
+            redis_client,
+            strategy_manager=strategy_manager
+        )
+        
+        # Warm the engine's cache before editing
+        strategy = await engine.strategy_manager.get_strategy(sample_strategy['id'])
+        assert strategy['conditions']['liquidity']['value'] == 10000
+        
+        await strategy_manager.update_strategy(
+            sample_strategy['id'],
+            conditions={
+                "liquidity": {
+                    "enabled": True,
+                    "operator": "greater_than",
+                    "value": 50000
+                }
+            }
+        )
+        
+        strategy = await engine.strategy_manager.get_strategy(sample_strategy['id'])
+        assert strategy['conditions']['liquidity']['value'] == 50000
+        
     @pytest.mark.asyncio
     async def test_delete_strategy(self, strategy_manager, sample_strategy):
         """Test soft deleting strategy"""